@@ -0,0 +1,13 @@
+from enum import Enum
+
+# Explicit values: these are written into replay files
+class Action(Enum):
+    LEFT = 1
+    RIGHT = 2
+    SOFT_DROP = 3
+    ROTATE_CCW = 4
+    ROTATE_CW = 5
+    HARD_DROP = 6
+    TOGGLE_SHADOW = 7
+    PAUSE = 8
+    RESUME = 9
@@ -0,0 +1,171 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from board import Board
+from game_stats import GameStats
+from grid import Grid
+from shapes import SHAPES
+
+# Steps N independent games at once. Every game's grid lives in one (N, rows, cols) uint8
+# array where 0 is empty and 1..7 is the index into SHAPES + 1.
+
+
+class BatchBoard:
+
+    COLORS = [None] + [shape.color for shape in SHAPES]
+
+    NOOP = 0
+    LEFT = 1
+    RIGHT = 2
+    DOWN = 3
+    ROTATE_CW = 4
+    ROTATE_CCW = 5
+    HARD_DROP = 6
+    ACTION_COUNT = 7
+
+    # (shape, orientation, cell, (col, row))
+    OFFSETS = np.array(
+        [[[(cell % 4, cell // 4) for cell in cells] for cells in shape.shape_lists] for shape in SHAPES],
+        dtype=np.int64,
+    )
+    POINTS = np.array([0] + [GameStats.BASE_POINTS[count] for count in range(1, 5)], dtype=np.int64)
+
+    def __init__(self, count: int, seed: Optional[int] = None, size: Optional[Tuple[int, int]] = None):
+        self.count = count
+        self.cols, self.rows = size if size is not None else Grid.GRID
+        # Centred like Board, (3, 0) on 10 columns
+        self.spawn_origin = ((self.cols - 4) // 2, 0)
+        self.rng = np.random.default_rng(seed)
+        self._envs = np.arange(count)
+
+        self.grid = np.zeros((count, self.rows, self.cols), dtype=np.uint8)
+        self.shape = np.zeros(count, dtype=np.int64)
+        self.x = np.zeros(count, dtype=np.int64)
+        self.y = np.zeros(count, dtype=np.int64)
+        self.orientation = np.zeros(count, dtype=np.int64)
+        self.bag = np.zeros((count, len(SHAPES)), dtype=np.int64)
+        self.bag_pos = np.zeros(count, dtype=np.int64)
+        self.level = np.zeros(count, dtype=np.int64)
+        self.lines_cleared = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.done = np.zeros(count, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        if mask is None:
+            mask = np.ones(self.count, dtype=bool)
+        envs = self._envs[mask]
+        if len(envs):
+            self.grid[envs] = 0
+            self.level[envs] = 0
+            self.lines_cleared[envs] = 0
+            self.score[envs] = 0
+            self.done[envs] = False
+            self._refill(envs)
+            self._spawn(envs)
+        return self.observation()
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        actions = np.broadcast_to(np.asarray(actions, dtype=np.int64), (self.count,))
+        live = ~self.done
+        score_before = self.score.copy()
+
+        x = self.x + (actions == self.RIGHT) - (actions == self.LEFT)
+        y = self.y + (actions == self.DOWN)
+        orientation = (self.orientation + (actions == self.ROTATE_CCW) - (actions == self.ROTATE_CW)) % 4
+        moved = live & self._fits(self._envs, self.shape, x, y, orientation)
+        self.x = np.where(moved, x, self.x)
+        self.y = np.where(moved, y, self.y)
+        self.orientation = np.where(moved, orientation, self.orientation)
+
+        dropping = live & (actions == self.HARD_DROP)
+        while dropping.any():
+            dropping &= self._fits(self._envs, self.shape, self.x, self.y + 1, self.orientation)
+            self.y += dropping
+
+        # Gravity: one row per step, lock whatever cannot fall
+        falls = self._fits(self._envs, self.shape, self.x, self.y + 1, self.orientation)
+        self.y += live & falls
+        locking = live & ~falls
+
+        cleared = np.zeros(self.count, dtype=np.int64)
+        envs = self._envs[locking]
+        if len(envs):
+            self._lock(envs)
+            cleared[envs] = self._clear_lines(envs)
+            self._score(envs, cleared[envs])
+            self._spawn(envs)
+
+        reward = self.score - score_before
+        done = self.done.copy()
+        info = {
+            "lines": cleared,
+            "locked": locking,
+            "score": self.score.copy(),
+            "lines_cleared": self.lines_cleared.copy(),
+        }
+        if done.any():
+            self.reset(done)
+        return self.observation(), reward, done, info
+
+    def observation(self) -> np.ndarray:
+        obs = self.grid.copy()
+        cells = self.OFFSETS[self.shape, self.orientation]
+        cols = self.x[:, None] + cells[..., 0]
+        rows = self.y[:, None] + cells[..., 1]
+        obs[self._envs[:, None], rows, cols] = self.shape[:, None] + 1
+        return obs
+
+    def peek(self) -> np.ndarray:
+        return self.bag[self._envs, self.bag_pos % len(SHAPES)]
+
+    def _fits(self, envs: np.ndarray, shape, x, y, orientation) -> np.ndarray:
+        cells = self.OFFSETS[shape, orientation]
+        cols = x[:, None] + cells[..., 0]
+        rows = y[:, None] + cells[..., 1]
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        occupied = self.grid[envs[:, None], rows.clip(0, self.rows - 1), cols.clip(0, self.cols - 1)] != 0
+        return (inside & ~occupied).all(axis=1)
+
+    def _refill(self, envs: np.ndarray):
+        self.bag[envs] = self.rng.permuted(np.tile(np.arange(len(SHAPES)), (len(envs), 1)), axis=1)
+        self.bag_pos[envs] = 0
+
+    def _spawn(self, envs: np.ndarray):
+        empty = envs[self.bag_pos[envs] >= len(SHAPES)]
+        if len(empty):
+            self._refill(empty)
+        self.shape[envs] = self.bag[envs, self.bag_pos[envs]]
+        self.bag_pos[envs] += 1
+        self.x[envs], self.y[envs] = self.spawn_origin
+        self.orientation[envs] = 0
+
+        blocked = ~self._fits(envs, self.shape[envs], self.x[envs], self.y[envs], self.orientation[envs])
+        topped_out = (self.grid[envs, :Board.VISIBLE_START_ROW] != 0).any(axis=(1, 2))
+        self.done[envs] |= blocked | topped_out
+
+    def _lock(self, envs: np.ndarray):
+        cells = self.OFFSETS[self.shape[envs], self.orientation[envs]]
+        cols = self.x[envs, None] + cells[..., 0]
+        rows = self.y[envs, None] + cells[..., 1]
+        self.grid[envs[:, None], rows, cols] = (self.shape[envs] + 1)[:, None]
+
+    def _clear_lines(self, envs: np.ndarray) -> np.ndarray:
+        grids = self.grid[envs]
+        full = (grids != 0).all(axis=2)
+        counts = full.sum(axis=1)
+        if not counts.any():
+            return counts
+        # Stable sort puts the full rows first and keeps the survivors in order below them
+        order = np.argsort(~full, axis=1, kind="stable")
+        grids = np.take_along_axis(grids, order[:, :, None], axis=1)
+        grids[np.arange(self.rows)[None, :] < counts[:, None]] = 0
+        self.grid[envs] = grids
+        return counts
+
+    def _score(self, envs: np.ndarray, counts: np.ndarray):
+        self.score[envs] += self.POINTS[counts] * (self.level[envs] + 1)
+        self.lines_cleared[envs] += counts
+        self.level[envs] = self.lines_cleared[envs] // 10
@@ -0,0 +1,8 @@
+from .boards import synthetic_board
+from .harness import Result, measure
+
+__all__ = [
+    "Result",
+    "measure",
+    "synthetic_board",
+]
@@ -0,0 +1,70 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+
+from bit_grid import BitGrid
+from grid import Grid
+
+from . import core, render
+
+GRIDS = {"grid": Grid, "bitgrid": BitGrid}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Time the game's hot paths.")
+    parser.add_argument("--grid", choices=[*GRIDS, "both"], default="both", help="grid backend(s) to run")
+    parser.add_argument("--suite", choices=["core", "render", "all"], default="all")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7, help="samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--output", "-o", metavar="PATH", default=None, help="write JSON here (default stdout)")
+    args = parser.parse_args()
+
+    grid_classes = list(GRIDS.values()) if args.grid == "both" else [GRIDS[args.grid]]
+    suites = [core, render] if args.suite == "all" else [core if args.suite == "core" else render]
+
+    results = []
+    for suite in suites:
+        for benchmark in suite.run(grid_classes, args.repeat, args.min_time):
+            # Each entry is measure() with its arguments bound; args[0] is the benchmark name
+            if args.filter not in benchmark.args[0]:
+                continue
+            result = benchmark()
+            results.append(result.to_dict())
+            params = " ".join(f"{key}={value}" for key, value in result.params.items())
+            print(f"{result.name:28} {params:28} {result.median * 1e6:10.2f} us  (iqr {result.iqr * 1e6:.2f})",
+                file=sys.stderr)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
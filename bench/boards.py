@@ -0,0 +1,22 @@
+import random
+
+from board import Board
+
+FILLS = (0.0, 0.25, 0.5, 0.75)
+
+
+def synthetic_board(grid_cls: type, fill: float, full_rows: int = 0, seed: int = 0) -> Board:
+    # A board in play with the bottom `fill` of the rows scattered with locked cells, every
+    # row left one gap short of clearing, plus `full_rows` complete rows at the very bottom
+    rng = random.Random(seed)
+    board = Board(grid_cls=grid_cls, seed=seed)
+    board.new_game()
+    grid = board.grid
+    colors = list(grid.PALETTE[1:])
+    filled = min(int(grid.rows * fill), grid.rows - Board.VISIBLE_START_ROW - 4)
+    for row in range(grid.rows - max(filled, full_rows), grid.rows):
+        gap = None if row >= grid.rows - full_rows else rng.randrange(grid.cols)
+        for col in range(grid.cols):
+            if col != gap and (gap is None or rng.random() < 0.7):
+                grid.set_cell_color(col, row, rng.choice(colors))
+    return board
@@ -0,0 +1,70 @@
+import random
+from functools import partial
+from typing import Callable, Iterator, Sequence
+
+from direction import Direction
+from headless import play_random_game
+from heading import Heading
+from piece_bag import PieceBag
+from shapes import SHAPES
+
+from .boards import FILLS, synthetic_board
+from .harness import Result, measure
+
+# Probes per _can_place call, spread over shapes, columns, rows and orientations
+PROBES = 64
+
+
+def run(grid_classes: Sequence[type], repeat: int, min_time: float) -> Iterator[Callable[[], Result]]:
+    timing = dict(repeat=repeat, min_time=min_time)
+
+    yield partial(measure, "PieceBag.next", PieceBag(random.Random(0)).next, **timing)
+
+    for grid_cls in grid_classes:
+        for fill in FILLS:
+            params = {"grid": grid_cls.__name__, "fill": fill}
+            board = synthetic_board(grid_cls, fill)
+
+            rng = random.Random(1)
+            probes = [(rng.choice(SHAPES), (rng.randrange(-2, board.grid.cols), rng.randrange(board.grid.rows)),
+                rng.randrange(4)) for _ in range(PROBES)]
+
+            def can_place(board=board, probes=probes):
+                for shape, origin, orientation in probes:
+                    board._can_place(shape, origin, orientation)
+
+            yield partial(measure, "Board._can_place", can_place, params, ops=PROBES, **timing)
+
+            def move(board=board):
+                board.move(Direction.LEFT)
+                board.move(Direction.RIGHT)
+
+            yield partial(measure, "Board.move", move, params, ops=2, **timing)
+
+            def rotate(board=board):
+                board.rotate(Heading.CW)
+                board.rotate(Heading.CCW)
+
+            yield partial(measure, "Board.rotate", rotate, params, ops=2, **timing)
+
+            def find_shadow_pos(board=board):
+                # Drop the cached key so every call does the full search
+                board._shadow_key = None
+                board.find_shadow_pos()
+
+            yield partial(measure, "Board.find_shadow_pos", find_shadow_pos, params, **timing)
+
+        for clears in range(5):
+            template = synthetic_board(grid_cls, 0.5, full_rows=clears)
+            rows = template.grid.rows
+            # As if a vertical I piece had just locked into the bottom four rows
+            template._lock_rows = range(rows - 4, rows)
+
+            yield partial(measure, "Board.remove_lines", lambda board: board.remove_lines(),
+                {"grid": grid_cls.__name__, "clears": clears},
+                setup=lambda number, template=template: [template.clone() for _ in range(number)], **timing)
+
+        board = synthetic_board(grid_cls, 0.0)
+        rng = random.Random(2)
+        yield partial(measure, "random game", lambda board=board, rng=rng: play_random_game(board, rng),
+            {"grid": grid_cls.__name__}, **timing)
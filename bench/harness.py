@@ -0,0 +1,84 @@
+import gc
+import statistics
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Result(NamedTuple):
+    name: str
+    params: Dict[str, Any]
+    # Calls timed back to back per sample
+    number: int
+    # Seconds per operation, one entry per sample
+    samples: List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    @property
+    def iqr(self) -> float:
+        if len(self.samples) < 4:
+            return max(self.samples) - min(self.samples)
+        q1, _, q3 = statistics.quantiles(self.samples, n=4)
+        return q3 - q1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "params": self.params,
+            "number": self.number,
+            "repeat": len(self.samples),
+            "min": min(self.samples),
+            "median": self.median,
+            "mean": statistics.fmean(self.samples),
+            "stdev": self.stdev,
+            "iqr": self.iqr,
+            "ops_per_sec": 1.0 / self.median if self.median > 0 else None,
+        }
+
+
+def _time(fn: Callable, args: Optional[List[Any]], number: int) -> float:
+    # Only the calls are timed: per-call inputs are built before the clock starts
+    if args is None:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return time.perf_counter() - start
+
+
+def measure(name: str, fn: Callable, params: Optional[Dict[str, Any]] = None,
+    setup: Optional[Callable[[int], List[Any]]] = None, ops: int = 1, repeat: int = 7,
+    min_time: float = 0.05) -> Result:
+    # fn runs `number` times per sample, with number doubled until a sample takes min_time, like
+    # timeit.autorange. With setup, fn takes one argument and setup(number) builds a fresh one per
+    # call, for operations that consume their input. ops divides out when one call does several.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            elapsed = _time(fn, setup(number) if setup else None, number)
+            if elapsed >= min_time:
+                break
+            number *= 2 if elapsed * 4 >= min_time else 4
+
+        samples = []
+        for _ in range(repeat):
+            elapsed = _time(fn, setup(number) if setup else None, number)
+            samples.append(elapsed / (number * ops))
+            # Collect between samples so garbage from one never lands in the next
+            gc.collect()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return Result(name, params or {}, number, samples)
@@ -0,0 +1,70 @@
+import os
+from functools import partial
+from typing import Callable, Iterator, Sequence
+
+from direction import Direction
+from grid import Grid
+
+from .boards import FILLS, synthetic_board
+from .harness import Result, measure
+
+# Screen size of the game window; everything draws to an offscreen surface of this size
+SIZE = (640, 736)
+
+
+def run(grid_classes: Sequence[type], repeat: int, min_time: float) -> Iterator[Callable[[], Result]]:
+    # No window: the dummy video driver is enough for fonts and software surfaces
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    import pygame
+    from menu_renderer import MenuRenderer
+    from renderer import BoardRenderer
+
+    pygame.init()
+    timing = dict(repeat=repeat, min_time=min_time)
+    surface = pygame.Surface(SIZE)
+
+    for grid_cls in grid_classes:
+        for fill in FILLS:
+            params = {"grid": grid_cls.__name__, "fill": fill}
+            board = synthetic_board(grid_cls, fill)
+            renderer = BoardRenderer(SIZE, board.grid.cols, board.grid.rows)
+            board.attach_renderers(renderer)
+            board.draw(surface)
+
+            def full_redraw(board=board, renderer=renderer):
+                renderer.invalidate()
+                board.draw(surface)
+
+            yield partial(measure, "BoardRenderer.draw full", full_redraw, params, **timing)
+
+            def cells(grid=board.grid, renderer=renderer):
+                # The locked cells are only re-rendered when the grid changes; this is that render
+                renderer._draw_cells(renderer._cells_surface, grid)
+
+            yield partial(measure, "BoardRenderer cells", cells, params, **timing)
+
+            def piece_moved(board=board, step=[Direction.LEFT, Direction.RIGHT]):
+                # Shift the piece back and forth: erase and redraw of the active and shadow pieces
+                board.move(step[0])
+                step.reverse()
+                board.draw(surface)
+
+            yield partial(measure, "BoardRenderer.draw moved", piece_moved, params, **timing)
+            yield partial(measure, "BoardRenderer.draw idle", lambda board=board: board.draw(surface), params,
+                **timing)
+
+    menu_grid = Grid(True)
+    menu = MenuRenderer(SIZE)
+
+    def compose():
+        menu._frame_key = None
+        menu.draw(surface, menu_grid, show_resume=False)
+
+    yield partial(measure, "MenuRenderer.draw compose", compose, **timing)
+
+    def present():
+        menu.invalidate()
+        menu.draw(surface, menu_grid, show_resume=False)
+
+    yield partial(measure, "MenuRenderer.draw present", present, **timing)
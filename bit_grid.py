@@ -0,0 +1,175 @@
+import random
+from typing import List, Optional, Tuple
+
+from color import Color
+from grid import Grid
+from tile import Tile
+
+# Grid backend storing each row as an int bitmask plus a compact colour plane.
+# Exposes the same API as Grid so Board can use either one.
+class BitGrid:
+
+    GRID = Grid.GRID
+    PALETTE = Grid.PALETTE
+    COLOR_INDEX = Grid.COLOR_INDEX
+
+    def __init__(self, fill_random=False, rng: Optional[random.Random] = None, size: Optional[Tuple[int, int]] = None):
+        rng = rng if rng is not None else random
+        self._cols, self._rows = size if size is not None else self.GRID
+        self._full = (1 << self._cols) - 1
+        self._row_bits: List[int] = [0] * self._rows
+        # One palette-index bytearray per row so clears can recycle rows instead of copying
+        self._colors: List[bytearray] = [bytearray(self._cols) for _ in range(self._rows)]
+        # Set while the colour rows are shared with a copy(); the first write takes a private copy
+        self._colors_shared = False
+        self._empty_row = bytes(self._cols)
+        self._tiles: Optional[List[Tile]] = None
+        self._version = 0
+        self._tops: List[int] = [self._rows] * self._cols
+        if fill_random:
+            color_list = [Color.GREEN, Color.BLUE, Color.YELLOW, Color.ORANGE, Color.LT_BLUE, Color.PURPLE]
+            for row in range(2, self._rows):
+                for col in range(self._cols):
+                    self.set_cell_color(col, row, rng.choice(color_list))
+
+    def index(self, col: int, row: int) -> int:
+        return row * self._cols + col
+
+    def in_bounds(self, col: int, row: int) -> bool:
+        return 0 <= col < self._cols and 0 <= row < self._rows
+
+    def is_empty(self, col: int, row: int) -> bool:
+        return not (self._row_bits[row] >> col) & 1
+
+    @property
+    def cols(self):
+        return self._cols
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def tops(self) -> List[int]:
+        return self._tops
+
+    def _scan_top(self, col: int, start: int) -> int:
+        bit = 1 << col
+        row_bits = self._row_bits
+        for row in range(start, self._rows):
+            if row_bits[row] & bit:
+                return row
+        return self._rows
+
+    @property
+    def row_bits(self) -> List[int]:
+        return self._row_bits
+
+    @property
+    def cells(self) -> List[Tile]:
+        # Materialised lazily for the renderers; simulations never touch it
+        if self._tiles is None:
+            self._tiles = [Tile(color=self.PALETTE[code], aid=1) for row in self._colors for code in row]
+        return self._tiles
+
+    def get_color(self, col: int, row: int) -> Color:
+        return self.PALETTE[self._colors[row][col]]
+
+    def _own_colors(self):
+        if self._colors_shared:
+            self._colors = [bytearray(row) for row in self._colors]
+            self._colors_shared = False
+
+    def copy(self) -> "BitGrid":
+        other = BitGrid.__new__(BitGrid)
+        other._cols = self._cols
+        other._rows = self._rows
+        other._full = self._full
+        other._row_bits = self._row_bits[:]
+        other._colors = self._colors
+        other._colors_shared = self._colors_shared = True
+        other._empty_row = self._empty_row
+        other._tiles = None
+        other._version = self._version
+        other._tops = self._tops[:]
+        return other
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self._colors)
+
+    def load_bytes(self, data: bytes):
+        cols = self._cols
+        self._colors = [bytearray(data[row * cols:(row + 1) * cols]) for row in range(self._rows)]
+        self._colors_shared = False
+        self._row_bits = [sum(1 << col for col, code in enumerate(row) if code) for row in self._colors]
+        self._tops = [self._scan_top(col, 0) for col in range(cols)]
+        self._tiles = None
+        self._version += 1
+
+    def set_cell_color(self, col: int, row: int, color: Color):
+        self._own_colors()
+        self._colors[row][col] = self.COLOR_INDEX[color]
+        if color == Color.BLACK:
+            self._row_bits[row] &= ~(1 << col)
+            if row == self._tops[col]:
+                self._tops[col] = self._scan_top(col, row + 1)
+        else:
+            self._row_bits[row] |= 1 << col
+            if row < self._tops[col]:
+                self._tops[col] = row
+        self._tiles = None
+        self._version += 1
+
+    def fits(self, placement, row: int) -> bool:
+        if row + placement.top < 0 or row + placement.bottom >= self._rows:
+            return False
+        row_bits = self._row_bits
+        for dr, mask in placement.row_masks:
+            if row_bits[row + dr] & mask:
+                return False
+        return True
+
+    def has_blocks_above(self, row: int) -> bool:
+        return any(self._row_bits[:row])
+
+    def is_row_full(self, row: int) -> bool:
+        return self._row_bits[row] == self._full
+
+    def clear_rows(self, rows) -> List[int]:
+        full_bits = self._full
+        row_bits = self._row_bits
+        full = [row for row in rows if row_bits[row] == full_bits]
+        if not full:
+            return full
+        full.sort()
+
+        # Shift surviving rows down in place, stopping at the highest filled row, then
+        # hand the cleared rows' colour buffers to the vacated rows at the top
+        self._own_colors()
+        colors = self._colors
+        recycled = [colors[row] for row in full]
+        stop = min(self._tops)
+        write = full[-1]
+        for read in range(full[-1], stop - 1, -1):
+            if read in full:
+                continue
+            if write != read:
+                row_bits[write] = row_bits[read]
+                colors[write] = colors[read]
+            write -= 1
+
+        for row, buf in zip(range(stop, write + 1), recycled):
+            buf[:] = self._empty_row
+            row_bits[row] = 0
+            colors[row] = buf
+
+        tops = self._tops
+        for col in range(self._cols):
+            tops[col] = self._scan_top(col, tops[col])
+        self._tiles = None
+        self._version += 1
+        return full
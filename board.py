@@ -1,54 +1,204 @@
-import pygame
-from typing import List
+import copy
+import random
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from color import Color
+from action import Action
+from board_state import BoardState
 from direction import Direction
+from event_bus import BoardEvent, EventBus
 from game_stats import GameStats
 from grid import Grid
 from heading import Heading
-from piece import Piece
+from move_generator import Landing, reachable_placements
+from piece import Piece, ShadowPiece
 from piece_bag import PieceBag
-from renderer import BoardRenderer
-from menu_renderer import MenuRenderer
-from shapes import Shape
-from tile import Tile
+from placement_table import placement_table
+from shapes import Shape, SHAPES
 from utils import GameState
 
+if TYPE_CHECKING:
+    import pygame
+
 class Board():
 
     LEVEL_SPEED: List[float] = [1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2, 0.1, 0.075, 0.05, 0.025]
     VISIBLE_START_ROW = 2
+    # Absorbs float error from summing fixed ticks so e.g. 120 ticks of 1/120s is a full second
+    GRAVITY_EPSILON = 1e-9
 
-    def __init__(self, size: tuple):
-        self.game_stats = GameStats()
-        self.grid = Grid()
-        self.menu_grid = Grid(True)
-        self.renderer = BoardRenderer(size=size, cols=self.grid.cols, rows=self.grid.rows)
-        self.menu_renderer = MenuRenderer(size)
+    def __init__(self, grid_cls: type = Grid, seed: Optional[int] = None, size: Optional[Tuple[int, int]] = None):
+        self.grid_cls = grid_cls
+        # Typed change notifications; piece_version counts spawns, moves and rotations
+        self.events = EventBus()
+        self.piece_version = 0
+        self._game_over_key = None
+        self._game_over = False
+        # (cols, rows), Grid.GRID unless a variant asks for something else
+        self.size = size if size is not None else Grid.GRID
+        # Every game draws its own seed from here, so one board seed reproduces a whole session
+        self._seeds = random.Random(seed)
+        self._seeds_shared = False
+        self.seed = self._seeds.getrandbits(63)
+        self.menu_rng = random.Random(seed)
+        self.game_stats = GameStats(events=self.events)
+        self.grid = self.grid_cls(size=self.size)
+        self.placements = placement_table(self.grid.cols)
+        # Pieces enter centred, which is (3, 0) on the standard 10 columns
+        self.spawn_origin = ((self.grid.cols - 4) // 2, 0)
+        # Random menu background, built the first time the menu is drawn
+        self._menu_grid: Optional[Grid] = None
+        # Renderers are optional observers so the game logic runs headless without pygame
+        self.renderer = None
+        self.menu_renderer = None
         self._game_state: GameState = GameState.MENU
         self._is_paused_menu = False
-        self.bag: PieceBag = PieceBag()
+        self._drawn_state: Optional[GameState] = None
+        self.bag: PieceBag = PieceBag(random.Random(self.seed))
+        self._shadow_key = None
+        self._lock_rows = range(0)
+        self._gravity_time = 0.0
+        self.shadow_piece: Optional[ShadowPiece] = None
         self._create_new_shape()
 
+    def attach_renderers(self, renderer=None, menu_renderer=None):
+        if self.renderer is not None:
+            self.events.unsubscribe(BoardEvent.STATS_CHANGED, self.renderer.on_stats_changed)
+        self.renderer = renderer
+        self.menu_renderer = menu_renderer
+        if renderer is not None:
+            # Stats are redrawn when they announce a change, not compared every frame
+            self.events.subscribe(BoardEvent.STATS_CHANGED, renderer.on_stats_changed)
+
+    def _set_stats(self, stats: GameStats):
+        # A new stats object (new game, restore) is a change of its own
+        self.game_stats = stats
+        self.events.publish(BoardEvent.STATS_CHANGED, stats)
+
+    @property
+    def menu_grid(self) -> Grid:
+        if self._menu_grid is None:
+            self._menu_grid = Grid(True, rng=self.menu_rng)
+        return self._menu_grid
+
+    def invalidate(self):
+        # Whatever is on screen is stale: the next draw repaints everything
+        self._drawn_state = None
+
     def is_game_over(self):
-        for col in range(self.grid.cols):
-            for row in range(self.VISIBLE_START_ROW):
-                if not self.grid.is_empty(col, row):
-                    return True
-        return False        
+        # Only a grid change can top the stack out, so the answer is kept per grid version
+        key = (self.grid, self.grid.version)
+        if key != self._game_over_key:
+            self._game_over_key = key
+            self._game_over = self.grid.has_blocks_above(self.VISIBLE_START_ROW)
+        return self._game_over
 
     def set_game_state(self, value=GameState.MENU):
+        changed = value != self._game_state
         self._game_state = value
         if self._game_state == GameState.MENU:
-            self.menu_grid = Grid(True)
+            self._menu_grid = None
+        if changed:
+            self.events.publish(BoardEvent.STATE_CHANGED, value)
 
-    def new_game(self):
-        self.game_stats = GameStats()
-        self.grid = Grid()
-        self.bag = PieceBag()
+    def new_game(self, seed: Optional[int] = None):
+        if self._seeds_shared:
+            self._seeds = copy.copy(self._seeds)
+            self._seeds_shared = False
+        self.seed = seed if seed is not None else self._seeds.getrandbits(63)
+        self._is_paused_menu = False
+        self._set_stats(GameStats(events=self.events))
+        self.grid = self.grid_cls(size=self.size)
+        self._lock_rows = range(0)
+        self._gravity_time = 0.0
+        self.bag = PieceBag(random.Random(self.seed))
         self._create_new_shape()
         self.set_game_state(GameState.PLAY)
-        self.renderer.set_game_state(GameState.PLAY)
+        if self.renderer is not None:
+            self.renderer.set_game_state(GameState.PLAY)
+
+    def snapshot(self) -> BoardState:
+        piece = self.active_piece
+        x, y = piece.origin
+        stats = self.game_stats
+        return BoardState(
+            cols=self.grid.cols,
+            rows=self.grid.rows,
+            seed=self.seed,
+            refills=self.bag.refills,
+            shape=SHAPES.index(piece.shape),
+            x=x,
+            y=y,
+            orientation=piece.orientation,
+            level=stats.level,
+            lines_cleared=stats.lines_cleared,
+            score=stats.score,
+            game_state=self._game_state.value,
+            paused=self._is_paused_menu,
+            gravity_time=self._gravity_time,
+            grid=self.grid.to_bytes(),
+            bag=bytes(SHAPES.index(shape) for shape in self.bag.bag),
+        )
+
+    def restore(self, state: BoardState):
+        if (state.cols, state.rows) != (self.grid.cols, self.grid.rows):
+            raise ValueError(f"snapshot is {state.cols}x{state.rows}, board is {self.grid.cols}x{self.grid.rows}")
+
+        self.grid = self.grid_cls(size=self.size)
+        self.grid.load_bytes(state.grid)
+        self._lock_rows = range(0)
+        self._set_stats(GameStats(state.level, state.lines_cleared, state.score, self.events))
+        self.seed = state.seed
+        self.bag = PieceBag.resume(random.Random(state.seed), state.refills, [SHAPES[i] for i in state.bag])
+        self._create_piece(Piece(SHAPES[state.shape], (state.x, state.y), state.orientation))
+        self._game_state = GameState(state.game_state)
+        self._is_paused_menu = state.paused
+        self._gravity_time = state.gravity_time
+        self.events.publish(BoardEvent.STATE_CHANGED, self._game_state)
+
+    def clone(self) -> "Board":
+        # Shares the immutable parts (shapes, placement table, menu grid); the grid and bag
+        # copy lazily, so a search can branch without rebuilding the world. Fields are listed one
+        # by one so nothing patched onto this instance (profiler wrappers, say) leaks into a branch.
+        other = Board.__new__(Board)
+        other.grid_cls = self.grid_cls
+        # A branch starts with no listeners of its own
+        other.events = EventBus(self.events.version)
+        other.piece_version = self.piece_version
+        other._game_over_key = None
+        other._game_over = False
+        other.size = self.size
+        other._seeds = self._seeds
+        other._seeds_shared = self._seeds_shared = True
+        other.seed = self.seed
+        other.menu_rng = self.menu_rng
+        other.game_stats = self.game_stats.copy(other.events)
+        other.grid = self.grid.copy()
+        other.placements = self.placements
+        other.spawn_origin = self.spawn_origin
+        other._menu_grid = self._menu_grid
+        other.renderer = None
+        other.menu_renderer = None
+        other._game_state = self._game_state
+        other._is_paused_menu = self._is_paused_menu
+        other._drawn_state = None
+        other.bag = self.bag.copy()
+        other._shadow_key = None
+        other._lock_rows = self._lock_rows
+        other._gravity_time = self._gravity_time
+        other.shadow_piece = None
+        piece = self.active_piece
+        other._create_piece(Piece(piece.shape, piece.origin, piece.orientation))
+        return other
+
+    def pause(self):
+        if self._game_state == GameState.PLAY:
+            self._is_paused_menu = True
+            self.set_game_state(GameState.MENU)
+
+    def resume(self):
+        if self._game_state == GameState.MENU and self._is_paused_menu:
+            self._is_paused_menu = False
+            self.set_game_state(GameState.PLAY)
 
     @property
     def is_paused_menu(self) -> bool:
@@ -62,12 +212,15 @@ class Board():
         return self.LEVEL_SPEED[self.game_stats.level]
 
     def set_new_piece(self):
-        color = self.active_piece.shape.color
-        x, y = self.active_piece.origin
-        for cell in self.active_piece.shape.get_shape(self.active_piece.orientation):
-            col = (cell % 4) + x
-            row = (cell // 4) + y
-            self.grid.set_cell_color(col, row, color)
+        piece = self.active_piece
+        x, y = piece.origin
+        color = piece.shape.color
+        placement = self.placements.get(piece.shape, piece.orientation, x)
+        for col, row in placement.cells:
+            self.grid.set_cell_color(col, row + y, color)
+        # Only rows the locked piece covers can have become full
+        self._lock_rows = range(y + placement.top, y + placement.bottom + 1)
+        self.events.publish(BoardEvent.PIECE_LOCKED, piece)
 
         self._create_new_shape()
         
@@ -79,14 +232,84 @@ class Board():
 
         return True
 
+    def lock_piece(self) -> List[int]:
+        was_over = self._game_state == GameState.DONE or self.is_game_over()
+        spawned = self.set_new_piece()
+        if not spawned:
+            self.set_game_state(GameState.DONE)
+        cleared = self.remove_lines()
+        # Either the next piece had no room or the stack now reaches the hidden rows
+        if not was_over and (not spawned or self.is_game_over()):
+            self.events.publish(BoardEvent.GAME_OVER, self.game_stats)
+        return cleared
+
+    def step(self) -> bool:
+        if self.move(Direction.DOWN):
+            return True
+        self.lock_piece()
+        return False
+
+    def apply(self, action: Action):
+        if action == Action.LEFT:
+            self.move(Direction.LEFT)
+        elif action == Action.RIGHT:
+            self.move(Direction.RIGHT)
+        elif action == Action.SOFT_DROP:
+            if not self.move(Direction.DOWN_WK):
+                self.lock_piece()
+        elif action == Action.ROTATE_CCW:
+            self.rotate(Heading.CCW)
+        elif action == Action.ROTATE_CW:
+            self.rotate(Heading.CW)
+        elif action == Action.HARD_DROP:
+            self.hard_drop()
+        elif action == Action.TOGGLE_SHADOW:
+            self.toggle_shadow()
+        elif action == Action.PAUSE:
+            self.pause()
+        elif action == Action.RESUME:
+            self.resume()
+
+    def update(self, dt: float) -> int:
+        # Gravity with the overshoot carried into the next drop; returns the number of drops
+        if self._game_state != GameState.PLAY or self.is_game_over():
+            self._gravity_time = 0.0
+            return 0
+
+        self._gravity_time += dt
+        drops = 0
+        while self._gravity_time + self.GRAVITY_EPSILON >= self.get_level_speed():
+            self._gravity_time -= self.get_level_speed()
+            self.step()
+            drops += 1
+            if self._game_state != GameState.PLAY or self.is_game_over():
+                self._gravity_time = 0.0
+                break
+        return drops
+
+    def deal(self, shape: Shape) -> bool:
+        # Swaps the active piece for shape at the spawn point, for searches that try pieces the
+        # bag has not dealt yet; False when it has no room
+        self._create_piece(Piece(shape, self.spawn_origin))
+        return self._can_place(shape, self.spawn_origin, 0)
+
     def _create_new_shape(self):
         shape: Shape = self.bag.next()
-        self.active_piece = Piece(shape)
-        self.shadow_shape = shape.clone()
-        self.shadow_piece = Piece(self.shadow_shape, (3, self.grid.rows - 2), 0)
+        self._create_piece(Piece(shape, self.spawn_origin))
+
+    def _create_piece(self, piece: Piece):
+        self.active_piece = piece
+        self._shadow_key = None
+        if self.shadow_piece is None:
+            self.shadow_piece = ShadowPiece(self.active_piece)
+        self.shadow_piece.piece = self.active_piece
+        self.shadow_piece.origin = (self.spawn_origin[0], self.grid.rows - 2)
+        self.piece_version += 1
+        self.events.publish(BoardEvent.PIECE_SPAWNED, piece)
 
     def toggle_shadow(self):
-        self.renderer.toggle_shadow()
+        if self.renderer is not None:
+            self.renderer.toggle_shadow()
 
     def move(self, direction: Direction = Direction.DOWN) -> bool:
         x, y = self.active_piece.origin
@@ -97,20 +320,60 @@ class Board():
         elif direction == Direction.DOWN or direction == Direction.DOWN_WK:
             y += 1
 
-        candidate_piece_origin = (x, y)
-        if not self._can_place(self.active_piece.shape, (x, y), self.active_piece.orientation):
+        if not self._fits(self.active_piece.shape, self.active_piece.orientation, x, y):
             return False
 
-        self.active_piece.origin = candidate_piece_origin
+        self.active_piece.origin = (x, y)
+        self.piece_version += 1
+        self.events.publish(BoardEvent.PIECE_MOVED, direction)
         return True
 
     def find_shadow_pos(self):
+        # Recomputed only after the piece or the grid changed
+        key = (self.piece_version, self.grid, self.grid.version)
+        if key == self._shadow_key:
+            return
+        self._shadow_key = key
+
         x, y = self.active_piece.origin
-        
-        while self._can_place(self.shadow_piece.shape, (x, y), self.shadow_piece.orientation):
-            y += 1
-       
-        self.shadow_piece.origin = (x, y - 1)
+        placement = self.placements.get(self.shadow_piece.shape, self.shadow_piece.orientation, x)
+        if placement is None or not self.grid.fits(placement, y):
+            self.shadow_piece.origin = (x, y - 1)
+            return
+
+        self.shadow_piece.origin = (x, self._drop_row(placement, y))
+
+    def drop_row(self) -> int:
+        piece = self.active_piece
+        x, y = piece.origin
+        return self._drop_row(self.placements.get(piece.shape, piece.orientation, x), y)
+
+    def _drop_row(self, placement, row: int) -> int:
+        # Resting row straight from the column height map; only a piece tucked under an
+        # overhang (already below some column top) needs the row-by-row walk
+        tops = self.grid.tops
+        landing = min(tops[col] - 1 - bottom for col, bottom in placement.skyline)
+        if landing >= row:
+            return landing
+
+        fits = self.grid.fits
+        while fits(placement, row + 1):
+            row += 1
+        return row
+
+    def reachable_placements(self) -> List[Landing]:
+        # Every resting state the active piece can reach with move/rotate from where it is now
+        piece = self.active_piece
+        return reachable_placements(self.grid, self.placements, piece.shape, piece.origin, piece.orientation)
+
+    def hard_drop(self) -> List[int]:
+        x, y = self.active_piece.origin
+        row = self.drop_row()
+        if row != y:
+            self.active_piece.origin = (x, row)
+            self.piece_version += 1
+            self.events.publish(BoardEvent.PIECE_MOVED, Direction.DOWN)
+        return self.lock_piece()
 
     def rotate(self, heading: Heading = Heading.CW):
         orientation = self.active_piece.orientation
@@ -120,60 +383,52 @@ class Board():
             orientation = (orientation - 1) % 4
 
         x, y = self.active_piece.origin
-        
-        if not self._can_place(self.active_piece.shape, (x, y), orientation):
+
+        if not self._fits(self.active_piece.shape, orientation, x, y):
             return False
 
         self.active_piece.orientation = orientation
-        self.shadow_piece.orientation = orientation
+        self.piece_version += 1
+        self.events.publish(BoardEvent.PIECE_ROTATED, heading)
         return True
    
     def _can_place(self, shape: Shape, origin: tuple[int, int], orientation: int) -> bool:
-        ox, oy = origin
-        for cell in shape.get_shape(orientation):
-            col = ox + (cell % 4)
-            row = oy + (cell // 4)
-            if not self.grid.in_bounds(col, row):
-                return False
-            if not self.grid.is_empty(col, row):
-                return False
-        return True
-
-    def remove_lines(self):
-        delete_rows: List[int] = []
-        col_counter = 0
-
-        for i, cell in enumerate(self.grid.cells):
-            col = i % 10
-            row = i // 10
-
-            if col == 0:
-                col_counter = 0
-            if cell.color != Color.BLACK:
-                col_counter += 1
-            if col == 9:
-                if col_counter == 10:
-                    delete_rows.append(row)
-
-        temp_grid: List[Tile] = []
-        for i, cell in enumerate(self.grid.cells):
-            row = i // 10
-            if not row in delete_rows:
-                temp_grid.append(cell)
+        return self._fits(shape, orientation, origin[0], origin[1])
 
-        for _ in range(0, len(delete_rows) * 10):
-            temp_grid.insert(0, Tile())
+    def _fits(self, shape: Shape, orientation: int, x: int, y: int) -> bool:
+        placement = self.placements.get(shape, orientation, x)
+        return placement is not None and self.grid.fits(placement, y)
 
-        self.grid.cells = temp_grid
-        self.game_stats.on_lines_cleared(len(delete_rows))
+    def remove_lines(self) -> List[int]:
+        rows = self._lock_rows
+        self._lock_rows = range(0)
+        cleared = self.grid.clear_rows(rows)
+        if cleared:
+            # The stats announce their own change and any level up
+            self.game_stats.on_lines_cleared(len(cleared))
+            self.events.publish(BoardEvent.LINES_CLEARED, cleared)
+        return cleared
 
-    def draw(self, surface: pygame.Surface):
+    def draw(self, surface: "pygame.Surface") -> Optional[List["pygame.Rect"]]:
+        # Returns the dirty rects to present, or None when the whole surface changed
         grid = self.grid
+        state_changed = self._game_state != self._drawn_state
+        self._drawn_state = self._game_state
         if self._game_state == GameState.DONE or self._game_state == GameState.PLAY:
+            if self.renderer is None:
+                return None
+            if state_changed:
+                self.renderer.invalidate()
+            if self._game_state == GameState.PLAY:
+                # Input handled since the last logic tick may have moved the piece the shadow views
+                self.find_shadow_pos()
             if self._game_state == GameState.DONE:
                 self.renderer.set_game_state(GameState.DONE)
 
-            self.renderer.draw(surface, cells=grid.cells, active_piece=self.active_piece, shadow_piece=self.shadow_piece, 
+            return self.renderer.draw(surface, grid=grid, active_piece=self.active_piece, shadow_piece=self.shadow_piece,
                 next_piece=self.bag.peek(), stats=self.game_stats)
-        elif self._game_state == GameState.MENU:
-            self.menu_renderer.draw(surface, cells=self.menu_grid.cells, show_resume=self.is_paused_menu)
+        elif self._game_state == GameState.MENU and self.menu_renderer is not None:
+            if state_changed:
+                self.menu_renderer.invalidate()
+            return self.menu_renderer.draw(surface, grid=self.menu_grid, show_resume=self.is_paused_menu)
+        return None
@@ -0,0 +1,54 @@
+import struct
+from typing import NamedTuple
+
+# Compact, serialisable copy of everything that decides how a game continues: grid colour
+# codes, bag order, active piece, stats and state. The bag rng is stored as the game seed plus
+# the number of refills drawn from it. Renderers are not part of it.
+MAGIC = b"TBST"
+VERSION = 2
+HEADER = struct.Struct("<4sBHHQIBhiBIIIBBd")
+
+
+class BoardState(NamedTuple):
+    cols: int
+    rows: int
+    seed: int
+    refills: int
+    shape: int
+    x: int
+    y: int
+    orientation: int
+    level: int
+    lines_cleared: int
+    score: int
+    game_state: int
+    paused: bool
+    gravity_time: float
+    grid: bytes
+    bag: bytes
+
+    def to_bytes(self) -> bytes:
+        return b"".join([
+            HEADER.pack(MAGIC, VERSION, self.cols, self.rows, self.seed, self.refills, self.shape, self.x,
+                self.y, self.orientation, self.level, self.lines_cleared, self.score, self.game_state,
+                self.paused, self.gravity_time),
+            self.grid,
+            bytes([len(self.bag)]),
+            self.bag,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BoardState":
+        (magic, version, cols, rows, seed, refills, shape, x, y, orientation, level, lines_cleared, score,
+            game_state, paused, gravity_time) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} board state")
+
+        offset = HEADER.size
+        grid = data[offset:offset + cols * rows]
+        offset += cols * rows
+        bag_len = data[offset]
+        bag = data[offset + 1:offset + 1 + bag_len]
+
+        return cls(cols, rows, seed, refills, shape, x, y, orientation, level, lines_cleared, score,
+            game_state, paused, gravity_time, bytes(grid), bytes(bag))
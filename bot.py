@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from action import Action
+from bit_grid import BitGrid
+from board import Board
+from board_state import BoardState
+from direction import Direction
+from heading import Heading
+from headless import is_finished
+from shapes import SHAPES
+
+# Placement bot: tries every final placement of the current piece, and of the next piece on top
+# of each, scores the resulting grids and plays the best one through Board.move/rotate. Searches
+# deeper than the preview average each later level over the 7 pieces the bag could deal, since
+# reading them out of the seeded bag would let the bot see what no player can.
+
+
+class Weights(NamedTuple):
+    height: float = -0.510066
+    lines: float = 0.760666
+    holes: float = -0.35663
+    bumpiness: float = -0.184483
+
+
+class Candidate(NamedTuple):
+    path: Tuple[Action, ...]
+    score: float
+
+
+def count_holes(grid) -> int:
+    row_bits = getattr(grid, "row_bits", None)
+    if row_bits is not None:
+        holes = 0
+        covered = 0
+        for bits in row_bits:
+            holes += bin(covered & ~bits).count("1")
+            covered |= bits
+        return holes
+
+    holes = 0
+    for col, top in enumerate(grid.tops):
+        for row in range(top + 1, grid.rows):
+            if grid.is_empty(col, row):
+                holes += 1
+    return holes
+
+
+def evaluate(board: Board, lines: int, weights: Weights) -> float:
+    if is_finished(board):
+        return float("-inf")
+
+    grid = board.grid
+    heights = [grid.rows - top for top in grid.tops]
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return (weights.height * sum(heights) + weights.lines * lines + weights.holes * count_holes(grid)
+        + weights.bumpiness * bumpiness)
+
+
+def placement_paths(board: Board) -> List[Tuple[Action, ...]]:
+    # Every reachable landing, tucks and spins included; one path per distinct set of final cells
+    piece = board.active_piece
+    cols = board.grid.cols
+    seen = set()
+    paths = []
+    for landing in board.reachable_placements():
+        placement = board.placements.get(piece.shape, landing.orientation, landing.x)
+        cells = frozenset(landing.row * cols + i for i in placement.indices)
+        if cells in seen:
+            continue
+        seen.add(cells)
+        paths.append(landing.path + (Action.HARD_DROP,))
+    return paths
+
+
+def play_path(board: Board, path: Sequence[Action]) -> Optional[int]:
+    # Returns the lines cleared, or None when a step of the path is blocked
+    for action in path:
+        if action == Action.LEFT:
+            ok = board.move(Direction.LEFT)
+        elif action == Action.RIGHT:
+            ok = board.move(Direction.RIGHT)
+        elif action == Action.SOFT_DROP:
+            ok = board.move(Direction.DOWN)
+        elif action == Action.ROTATE_CCW:
+            ok = board.rotate(Heading.CCW)
+        elif action == Action.ROTATE_CW:
+            ok = board.rotate(Heading.CW)
+        elif action == Action.HARD_DROP:
+            return len(board.hard_drop())
+        else:
+            board.apply(action)
+            ok = True
+        if not ok:
+            return None
+    return 0
+
+
+def score_path(board: Board, path: Sequence[Action], weights: Weights, depth: int,
+        seen: int = 2) -> Tuple[float, int]:
+    # Plays path on board (mutating it) and returns the best score within depth placements,
+    # plus how many placements were tried; lines from earlier placements count toward the score.
+    # seen is how many pieces from this one on were visible when the search started.
+    lines = play_path(board, path)
+    if lines is None:
+        return float("-inf"), 0
+    score = evaluate(board, lines, weights)
+    if depth <= 1 or score == float("-inf"):
+        return score, 1
+
+    if seen > 1:
+        best, tried = best_placement(board, weights, depth - 1, seen - 1)
+        return best + weights.lines * lines, tried + 1
+
+    # The piece now up came out of the bag after the preview: expect over every shape it could be
+    total = 0.0
+    tried = 1
+    for shape in SHAPES:
+        branch = board.clone()
+        if not branch.deal(shape):
+            return float("-inf"), tried
+        best, count = best_placement(branch, weights, depth - 1, 0)
+        total += best
+        tried += count
+    return total / len(SHAPES) + weights.lines * lines, tried
+
+
+def best_placement(board: Board, weights: Weights, depth: int, seen: int) -> Tuple[float, int]:
+    best = float("-inf")
+    tried = 0
+    for path in placement_paths(board):
+        score, count = score_path(board.clone(), path, weights, depth, seen)
+        tried += count
+        best = max(best, score)
+    return best, tried
+
+
+def _score_snapshot(state: BoardState, path: Tuple[Action, ...], weights: Weights, depth: int) -> Tuple[float, int]:
+    # Process pool entry point: boards do not pickle, their snapshots do
+    board = Board(grid_cls=BitGrid)
+    board.restore(state)
+    return score_path(board, path, weights, depth)
+
+
+class Bot:
+
+    # First moves handed to a pool worker at a time; fewer round trips per decision
+    CHUNK = 4
+
+    def __init__(self, weights: Weights = Weights(), depth: int = 2, executor: Optional[Executor] = None):
+        self.weights = weights
+        # Depth 2 searches the current piece and the next one from PieceBag.peek; each level past
+        # that averages over the 7 unseen pieces and costs about 7 placement lists more
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1, got {depth}")
+        self.depth = depth
+        self.executor = executor
+        self.placements_evaluated = 0
+
+    def choose(self, board: Board) -> Optional[Candidate]:
+        paths = placement_paths(board)
+        if self.executor is not None:
+            state = board.snapshot()
+            results = list(self.executor.map(_score_snapshot, [state] * len(paths), paths,
+                [self.weights] * len(paths), [self.depth] * len(paths), chunksize=self.CHUNK))
+        else:
+            results = [score_path(board.clone(), path, self.weights, self.depth) for path in paths]
+
+        best: Optional[Candidate] = None
+        for path, (score, tried) in zip(paths, results):
+            self.placements_evaluated += tried
+            if tried and (best is None or score > best.score):
+                best = Candidate(path, score)
+        return best
+
+    def play_move(self, board: Board) -> bool:
+        candidate = self.choose(board)
+        if candidate is None:
+            board.hard_drop()
+            return False
+        play_path(board, candidate.path)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the placement bot on headless games.")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--max-pieces", type=int, default=500, help="stop a game after this many pieces")
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (0 = search in this process)")
+    parser.add_argument("--depth", type=int, default=2,
+        help="placements searched per move (2 = current + next, deeper levels average the unseen pieces)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 0 else None
+    bot = Bot(depth=args.depth, executor=executor)
+    board = Board(grid_cls=BitGrid, seed=args.seed)
+
+    pieces = 0
+    lines = 0
+    start = time.perf_counter()
+    try:
+        for _ in range(args.games):
+            board.new_game()
+            for _ in range(args.max_pieces):
+                if is_finished(board):
+                    break
+                bot.play_move(board)
+                pieces += 1
+            lines += board.game_stats.lines_cleared
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    print(f"games: {args.games}  pieces: {pieces}  avg lines/game: {lines / args.games:.1f}")
+    print(f"elapsed: {elapsed:.2f}s  placements/s: {bot.placements_evaluated / elapsed:.0f}  "
+        f"pieces/s: {pieces / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from enum import Enum, auto
+from typing import Any, Callable, Dict, List, NamedTuple
+
+
+class BoardEvent(Enum):
+    PIECE_SPAWNED = auto()
+    PIECE_MOVED = auto()
+    PIECE_ROTATED = auto()
+    PIECE_LOCKED = auto()
+    LINES_CLEARED = auto()
+    LEVEL_UP = auto()
+    STATE_CHANGED = auto()
+    GAME_OVER = auto()
+    STATS_CHANGED = auto()
+
+
+class Event(NamedTuple):
+    kind: BoardEvent
+    # Bus version after this event; strictly increasing over the bus's lifetime
+    version: int
+    data: Any = None
+
+
+class EventBus:
+
+    def __init__(self, version: int = 0):
+        self.version = version
+        self._handlers: Dict[BoardEvent, List[Callable[[Event], None]]] = {}
+
+    def subscribe(self, kind: BoardEvent, handler: Callable[[Event], None]):
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def unsubscribe(self, kind: BoardEvent, handler: Callable[[Event], None]):
+        handlers = self._handlers.get(kind)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, kind: BoardEvent, data: Any = None):
+        # The counter always moves; the Event is only built when someone listens
+        self.version += 1
+        handlers = self._handlers.get(kind)
+        if handlers:
+            event = Event(kind, self.version, data)
+            for handler in handlers:
+                handler(event)
@@ -0,0 +1,29 @@
+class FixedTimestep:
+
+    # Cap on ticks per advance() so a long stall can't snowball into ever longer frames
+    MAX_STEPS = 8
+
+    def __init__(self, step: float, max_steps: int = MAX_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped = 0
+
+    def advance(self, dt: float) -> int:
+        self.accumulator += dt
+        count = 0
+        while self.accumulator >= self.step and count < self.max_steps:
+            self.accumulator -= self.step
+            count += 1
+
+        if self.accumulator >= self.step:
+            backlog = int(self.accumulator // self.step)
+            self.dropped += backlog
+            self.accumulator -= backlog * self.step
+
+        self.ticks += count
+        return count
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import random
+import struct
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from action import Action
+from bit_grid import BitGrid
+from board import Board
+from board_state import BoardState
+from fixed_timestep import FixedTimestep
+from grid import parse_size
+from headless import is_finished
+
+# Runs many independent boards in one process under a single asyncio scheduler. Clients talk
+# to it over a local TCP socket:
+#   client -> host  MESSAGE: kind, game id, value (an Action value for INPUT)
+#   host -> client  STATE header: game id, payload length; then a BoardState, sent to a game's
+#                   subscribers whenever it changed, at most state_hz times a second
+INPUT, SUBSCRIBE, UNSUBSCRIBE, NEW_GAME = 1, 2, 3, 4
+MESSAGE = struct.Struct("<BHB")
+STATE = struct.Struct("<HI")
+
+
+class HostedGame:
+
+    def __init__(self, game_id: int, board: Board, step: float, tick_budget: int, now: float):
+        self.id = game_id
+        self.board = board
+        # The tick budget caps how far one game may catch up in a single round
+        self.timestep = FixedTimestep(step, max_steps=tick_budget)
+        self.last_update = now
+        self.inputs: Deque[Action] = deque()
+        self.subscribers: Set[asyncio.StreamWriter] = set()
+        self._published = None
+
+    def update(self, now: float):
+        # Same order as App.run: the logic ticks that are due, then the inputs that arrived
+        dt = now - self.last_update
+        self.last_update = now
+        board = self.board
+        step = self.timestep.step
+        for _ in range(self.timestep.advance(dt)):
+            board.update(step)
+        inputs = self.inputs
+        while inputs:
+            board.apply(inputs.popleft())
+
+    def changed(self) -> bool:
+        board = self.board
+        piece = board.active_piece
+        key = (board.grid, board.grid.version, piece, piece.origin, piece.orientation, board.game_state)
+        if key == self._published:
+            return False
+        self._published = key
+        return True
+
+
+class GameHost:
+
+    # Writers with more than this many bytes still queued skip state frames until they drain
+    MAX_BACKLOG = 64 * 1024
+
+    def __init__(self, count: int, logic_hz: int = 120, state_hz: int = 30, grid_cls: type = BitGrid,
+        seed: Optional[int] = None, size: Optional[Tuple[int, int]] = None, tick_budget: int = 4,
+        round_budget: Optional[float] = None):
+        self.logic_hz = logic_hz
+        self.state_hz = state_hz
+        # Wall time one scheduling round may take; games not reached carry over to the next round
+        self.round_budget = round_budget if round_budget is not None else 0.5 / logic_hz
+        seeds = random.Random(seed)
+        now = time.perf_counter()
+        self.games: List[HostedGame] = []
+        for game_id in range(count):
+            board = Board(grid_cls=grid_cls, seed=seeds.getrandbits(63), size=size)
+            board.new_game()
+            self.games.append(HostedGame(game_id, board, 1.0 / logic_hz, tick_budget, now))
+        self._cursor = 0
+        self.rounds = 0
+        self.deferred = 0
+        self.inputs_received = 0
+        self.states_sent = 0
+        self.is_running = False
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def update(self):
+        # One round over the games, starting where the last over-budget round stopped
+        games = self.games
+        start = time.perf_counter()
+        count = len(games)
+        for i in range(count):
+            game = games[(self._cursor + i) % count]
+            game.update(time.perf_counter())
+            if time.perf_counter() - start > self.round_budget and i + 1 < count:
+                self._cursor = (self._cursor + i + 1) % count
+                self.deferred += count - i - 1
+                break
+        self.rounds += 1
+
+    def publish(self):
+        for game in self.games:
+            if not game.subscribers or not game.changed():
+                continue
+            payload = game.board.snapshot().to_bytes()
+            frame = STATE.pack(game.id, len(payload)) + payload
+            for writer in game.subscribers:
+                if writer.transport.get_write_buffer_size() <= self.MAX_BACKLOG:
+                    writer.write(frame)
+                    self.states_sent += 1
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscribed: Set[HostedGame] = set()
+        try:
+            while True:
+                kind, game_id, value = MESSAGE.unpack(await reader.readexactly(MESSAGE.size))
+                if game_id >= len(self.games):
+                    continue
+                game = self.games[game_id]
+                if kind == INPUT:
+                    game.inputs.append(Action(value))
+                    self.inputs_received += 1
+                elif kind == SUBSCRIBE:
+                    game.subscribers.add(writer)
+                    game._published = None
+                    subscribed.add(game)
+                elif kind == UNSUBSCRIBE:
+                    game.subscribers.discard(writer)
+                    subscribed.discard(game)
+                elif kind == NEW_GAME:
+                    game.board.new_game()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            for game in subscribed:
+                game.subscribers.discard(writer)
+            writer.close()
+
+    async def run(self, duration: Optional[float] = None, on_publish=None):
+        # Fixed-rate scheduler: a round of logic every tick, state out every 1/state_hz
+        tick = 1.0 / self.logic_hz
+        publish_every = 1.0 / self.state_hz
+        start = time.perf_counter()
+        next_tick = start
+        next_publish = start
+        for game in self.games:
+            game.last_update = start
+        self.is_running = True
+        while self.is_running:
+            now = time.perf_counter()
+            if duration is not None and now - start >= duration:
+                break
+            self.update()
+            if now >= next_publish:
+                next_publish += publish_every
+                self.publish()
+                if on_publish is not None:
+                    on_publish(self)
+            next_tick += tick
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+        self.is_running = False
+
+    def stop(self):
+        self.is_running = False
+        if self._server is not None:
+            self._server.close()
+
+
+class HostClient:
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 0) -> "HostClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def send(self, kind: int, game_id: int, value: int = 0):
+        self.writer.write(MESSAGE.pack(kind, game_id, value))
+
+    def input(self, game_id: int, action: Action):
+        self.send(INPUT, game_id, action.value)
+
+    def subscribe(self, game_id: int):
+        self.send(SUBSCRIBE, game_id)
+
+    async def read_state(self) -> Tuple[int, BoardState]:
+        game_id, length = STATE.unpack(await self.reader.readexactly(STATE.size))
+        return game_id, BoardState.from_bytes(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+RANDOM_ACTIONS = (Action.LEFT, Action.RIGHT, Action.ROTATE_CW, Action.ROTATE_CCW, Action.SOFT_DROP)
+
+
+async def random_client(port: int, game_ids: List[int], rate: float, seed: int, received: Dict[int, int]):
+    # Stand-in player: sends random inputs to its games and counts the states it gets back
+    client = await HostClient.connect(port=port)
+    rng = random.Random(seed)
+    for game_id in game_ids:
+        client.subscribe(game_id)
+
+    async def read():
+        while True:
+            game_id, _ = await client.read_state()
+            received[game_id] = received.get(game_id, 0) + 1
+
+    reader = asyncio.ensure_future(read())
+    try:
+        while True:
+            for game_id in game_ids:
+                client.input(game_id, rng.choice(RANDOM_ACTIONS))
+            await client.writer.drain()
+            await asyncio.sleep(1.0 / rate)
+    finally:
+        reader.cancel()
+        await client.close()
+
+
+async def main_async(args):
+    host = GameHost(args.games, logic_hz=args.logic_hz, state_hz=args.state_hz, seed=args.seed, size=args.size,
+        tick_budget=args.tick_budget)
+    port = await host.serve(port=args.port)
+    print(f"hosting {args.games} games on 127.0.0.1:{port}")
+
+    on_publish = None
+    if args.spectate:
+        from spectator import SpectatorWindow
+        window = SpectatorWindow(len(host.games), *host.games[0].board.size)
+
+        def on_publish(host):
+            if not window.draw([game.board for game in host.games]):
+                host.stop()
+
+    received: Dict[int, int] = {}
+    clients = [asyncio.ensure_future(random_client(port, list(range(i, args.games, args.clients)), args.input_hz,
+        i, received)) for i in range(args.clients)]
+    start = time.perf_counter()
+    await host.run(duration=args.seconds, on_publish=on_publish)
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        client.cancel()
+    await asyncio.gather(*clients, return_exceptions=True)
+    host.stop()
+
+    ticks = sum(game.timestep.ticks for game in host.games)
+    dropped = sum(game.timestep.dropped for game in host.games)
+    finished = sum(is_finished(game.board) for game in host.games)
+    print(f"elapsed: {elapsed:.2f}s  rounds/s: {host.rounds / elapsed:.0f}  logic ticks/s: {ticks / elapsed:.0f}  "
+        f"dropped ticks: {dropped}  deferred: {host.deferred}")
+    print(f"inputs: {host.inputs_received}  states sent: {host.states_sent}  received: {sum(received.values())}  "
+        f"games over: {finished}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many Tetris games in one process.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10.0, help="run this long, then report")
+    parser.add_argument("--port", type=int, default=0, help="TCP port on 127.0.0.1 (0 picks a free one)")
+    parser.add_argument("--logic-hz", type=int, default=120)
+    parser.add_argument("--state-hz", type=int, default=30, help="state updates sent per second")
+    parser.add_argument("--tick-budget", type=int, default=4, help="most logic ticks one game may run per round")
+    parser.add_argument("--clients", type=int, default=4, help="random-input clients to connect (0 for none)")
+    parser.add_argument("--input-hz", type=float, default=10.0, help="inputs per second each client sends per game")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--size", type=parse_size, default=None, metavar="COLSxROWS")
+    parser.add_argument("--spectate", action="store_true", help="show every board in one tiled window")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+from typing import Optional
+
+from event_bus import BoardEvent, EventBus
+
+
 class GameStats():
 
     BASE_POINTS = {
@@ -7,18 +12,37 @@ class GameStats():
         4: 1200
     }
 
-    def __init__(self):
-        self._level: int = 0
-        self._lines_cleared: int = 0
-        self._score: int = 0
+    def __init__(self, level: int = 0, lines_cleared: int = 0, score: int = 0, events: Optional[EventBus] = None):
+        self._level: int = level
+        self._lines_cleared: int = lines_cleared
+        self._score: int = score
+        # Bumped whenever a stat changes so displays can skip re-reading them
+        self._version: int = 0
+        # Changes are announced here (STATS_CHANGED, LEVEL_UP); None for a detached copy
+        self.events = events
+
+    def copy(self, events: Optional[EventBus] = None) -> "GameStats":
+        other = GameStats(self._level, self._lines_cleared, self._score, events)
+        other._version = self._version
+        return other
 
     def on_lines_cleared(self, count: int=1):
         if count not in self.BASE_POINTS:
             return
 
+        level = self._level
         self._score += self.BASE_POINTS[count] * (self._level + 1)
         self._lines_cleared += count
         self._level = self._lines_cleared // 10
+        self._version += 1
+        if self.events is not None:
+            self.events.publish(BoardEvent.STATS_CHANGED, self)
+            if self._level > level:
+                self.events.publish(BoardEvent.LEVEL_UP, self._level)
+
+    @property
+    def version(self):
+        return self._version
 
     @property
     def level(self):
@@ -1,23 +1,43 @@
 import random
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from color import Color
 from tile import Tile
 
+def parse_size(text: str) -> Tuple[int, int]:
+    # "COLSxROWS" from the command line, e.g. 10x22
+    cols, sep, rows = text.lower().partition("x")
+    if not sep or not cols.isdigit() or not rows.isdigit() or int(cols) < 4 or int(rows) < 6:
+        raise ValueError(f"board size must look like 10x22 (at least 4x6), got {text!r}")
+    return int(cols), int(rows)
+
+
 class Grid:
 
     GRID = (10, 22)
+    # Compact colour codes used by packed grids and snapshots
+    PALETTE: List[Color] = [Color.BLACK, Color.RED, Color.GREEN, Color.BLUE, Color.YELLOW,
+                            Color.ORANGE, Color.LT_BLUE, Color.PURPLE, Color.WHITE]
+    COLOR_INDEX: Dict[Color, int] = {color: i for i, color in enumerate(PALETTE)}
 
-    def __init__(self, fill_random=False):
-        self._cols, self._rows = self.GRID
+    def __init__(self, fill_random=False, rng: Optional[random.Random] = None, size: Optional[Tuple[int, int]] = None):
+        rng = rng if rng is not None else random
+        self._cols, self._rows = size if size is not None else self.GRID
         self._cells: List[Tile] = []
         color_list = [Color.RED, Color.GREEN, Color.BLUE, Color.YELLOW, Color.ORANGE, Color.LT_BLUE, Color.PURPLE]
         for i in range(self._cols * self._rows):
             if fill_random and (i // self._cols) >= 2:
-                color = random.choice(color_list[1:])
+                color = rng.choice(color_list[1:])
             else:
                 color = Color.BLACK
             self._cells.append(Tile(color=color, aid=1))
+        # Bumped on every mutation so callers can cache anything derived from the cells
+        self._version = 0
+        # Topmost filled row per column, rows when the column is empty
+        if fill_random:
+            self._tops: List[int] = [self._scan_top(col, 0) for col in range(self._cols)]
+        else:
+            self._tops = [self._rows] * self._cols
 
     def index(self, col: int, row: int) -> int:
         return row * self._cols + col
@@ -28,6 +48,9 @@ class Grid:
     def is_empty(self, col: int, row: int) -> bool:
         return self.cells[self.index(col, row)].is_empty()
 
+    def get_color(self, col: int, row: int) -> Color:
+        return self._cells[row * self._cols + col].color
+
     @property
     def cols(self):
         return self._cols
@@ -43,7 +66,99 @@ class Grid:
     @cells.setter
     def cells(self, value):
         self._cells = value
+        self._tops = [self._scan_top(col, 0) for col in range(self._cols)]
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def tops(self) -> List[int]:
+        return self._tops
+
+    def _scan_top(self, col: int, start: int) -> int:
+        for row in range(start, self._rows):
+            if not self._cells[row * self._cols + col].is_empty():
+                return row
+        return self._rows
 
     def set_cell_color(self, col: int, row: int, color: Color):
         self._cells[row * self._cols + col].color = color
-    
+        if color != Color.BLACK:
+            if row < self._tops[col]:
+                self._tops[col] = row
+        elif row == self._tops[col]:
+            self._tops[col] = self._scan_top(col, row + 1)
+        self._version += 1
+
+    def fits(self, placement, row: int) -> bool:
+        if row + placement.top < 0 or row + placement.bottom >= self._rows:
+            return False
+        base = row * self._cols
+        cells = self._cells
+        for i in placement.indices:
+            if not cells[base + i].is_empty():
+                return False
+        return True
+
+    def has_blocks_above(self, row: int) -> bool:
+        return min(self._tops) < row
+
+    def copy(self) -> "Grid":
+        other = Grid.__new__(Grid)
+        other._cols = self._cols
+        other._rows = self._rows
+        other._cells = [Tile(color=tile.color, aid=1) for tile in self._cells]
+        other._version = self._version
+        other._tops = self._tops[:]
+        return other
+
+    def to_bytes(self) -> bytes:
+        index = self.COLOR_INDEX
+        return bytes(index[tile.color] for tile in self._cells)
+
+    def load_bytes(self, data: bytes):
+        palette = self.PALETTE
+        for tile, code in zip(self._cells, data):
+            tile.color = palette[code]
+        self._tops = [self._scan_top(col, 0) for col in range(self._cols)]
+        self._version += 1
+
+    def is_row_full(self, row: int) -> bool:
+        base = row * self._cols
+        cells = self._cells
+        for i in range(base, base + self._cols):
+            if cells[i].is_empty():
+                return False
+        return True
+
+    def clear_rows(self, rows) -> List[int]:
+        full = [row for row in rows if self.is_row_full(row)]
+        if not full:
+            return full
+        full.sort()
+
+        # Shift the surviving rows down in place, stopping at the highest filled row
+        cols = self._cols
+        cells = self._cells
+        stop = min(self._tops)
+        write = full[-1]
+        for read in range(full[-1], stop - 1, -1):
+            if read in full:
+                continue
+            if write != read:
+                src = read * cols
+                dst = write * cols
+                for i in range(cols):
+                    cells[dst + i].color = cells[src + i].color
+            write -= 1
+
+        for i in range(stop * cols, (write + 1) * cols):
+            cells[i].color = Color.BLACK
+
+        tops = self._tops
+        for col in range(cols):
+            tops[col] = self._scan_top(col, tops[col])
+        self._version += 1
+        return full
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import time
+
+from action import Action
+from bit_grid import BitGrid
+from board import Board
+from grid import Grid, parse_size
+from telemetry import TelemetryLog
+from utils import GameState
+
+# Runs games with no pygame, display or fonts: batch jobs, CI and engine throughput checks
+
+
+def is_finished(board: Board) -> bool:
+    return board.game_state != GameState.PLAY or board.is_game_over()
+
+
+RANDOM_ACTIONS = (Action.LEFT, Action.RIGHT, Action.ROTATE_CW, Action.ROTATE_CCW)
+
+
+def play_random_game(board: Board, rng: random.Random, max_steps: int = 100000) -> int:
+    board.new_game()
+    steps = 0
+    while steps < max_steps and not is_finished(board):
+        action = rng.randrange(6)
+        if action < len(RANDOM_ACTIONS):
+            board.apply(RANDOM_ACTIONS[action])
+        else:
+            board.step()
+        steps += 1
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless random-play Tetris games.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bitboard", action="store_true", help="use the BitGrid backend")
+    parser.add_argument("--size", type=parse_size, default=None, metavar="COLSxROWS", help="board dimensions")
+    parser.add_argument("--telemetry", metavar="PATH", default=None, help="log locks, clears and game overs to PATH")
+    parser.add_argument("--telemetry-gzip", action="store_true", help="compress rotated telemetry files")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    board = Board(grid_cls=BitGrid if args.bitboard else Grid, seed=args.seed, size=args.size)
+    telemetry = None
+    if args.telemetry is not None:
+        telemetry = TelemetryLog(args.telemetry, compress=args.telemetry_gzip)
+        telemetry.attach(board)
+
+    steps = 0
+    lines = 0
+    start = time.perf_counter()
+    for _ in range(args.games):
+        steps += play_random_game(board, rng)
+        lines += board.game_stats.lines_cleared
+    elapsed = time.perf_counter() - start
+
+    print(f"games: {args.games}  steps: {steps}  lines: {lines}")
+    print(f"elapsed: {elapsed:.3f}s  games/s: {args.games / elapsed:.1f}  steps/s: {steps / elapsed:.0f}")
+    if telemetry is not None:
+        telemetry.close()
+        print(f"telemetry: {telemetry.emitted} events  written: {telemetry.written}  dropped: {telemetry.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from profiler import percentiles
+
+# Input-to-present latency. pygame does not expose SDL's event timestamps, so each input is
+# stamped with the poll that delivered it; the key went down somewhere between the previous
+# poll and that one, which bounds the true latency from both sides.
+
+
+class InputLatency:
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window: int = 1000):
+        self._poll_time = time.perf_counter()
+        self._previous_poll = self._poll_time
+        # (poll time, previous poll time) of inputs applied but not yet on screen
+        self._pending: List[Tuple[float, float]] = []
+        # Poll to present: what the game itself adds once it has seen the input
+        self.handled: Deque[float] = deque(maxlen=window)
+        # Previous poll to present: the worst case including the wait before the poll
+        self.worst: Deque[float] = deque(maxlen=window)
+
+    def polled(self):
+        self._previous_poll = self._poll_time
+        self._poll_time = time.perf_counter()
+
+    def checked_empty(self):
+        # The queue was seen empty just now, so anything in the next poll arrived after this
+        self._poll_time = time.perf_counter()
+
+    def record(self):
+        self._pending.append((self._poll_time, self._previous_poll))
+
+    def presented(self):
+        if not self._pending:
+            return
+        now = time.perf_counter()
+        for polled, previous in self._pending:
+            self.handled.append(now - polled)
+            self.worst.append(now - previous)
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for name, samples in (("handled", self.handled), ("worst", self.worst)):
+            entry = {f"p{p}": value for p, value in zip(self.PERCENTILES, percentiles(samples, self.PERCENTILES))}
+            entry["max"] = max(samples, default=0.0)
+            entry["count"] = len(samples)
+            stats[name] = entry
+        return stats
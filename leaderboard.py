@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import argparse
+import getpass
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+# Finished games in an SQLite file. Writes are queued to one writer thread that commits them
+# in batches, so a game over never waits on the disk; queries run on the caller's own
+# connection and are served from the score indexes, whatever the number of rows.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, score DESC);
+"""
+COLUMNS = "player, score, lines, level, duration, played_at"
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".tetris_scores.db")
+
+
+class Score(NamedTuple):
+    player: str
+    score: int
+    lines: int
+    level: int
+    duration: float
+    played_at: float
+
+
+def default_player() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "player"
+
+
+class Leaderboard:
+
+    # Most queued scores committed in one transaction
+    BATCH = 512
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self._queue: "queue.Queue[Optional[Score]]" = queue.Queue()
+        # Scores the writer could not save
+        self.failed = 0
+        self._writer = threading.Thread(target=self._write_loop, name="leaderboard", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        # WAL lets queries read while the writer commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def submit(self, score: Score):
+        # Never blocks; the row shows up in queries once the writer has committed it
+        self._queue.put(score)
+
+    def flush(self):
+        if not self._writer.is_alive():
+            raise RuntimeError("leaderboard writer has stopped")
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._conn.close()
+
+    def _write_loop(self):
+        # A batch that fails (locked or full disk, a bad file) is reported and counted; the
+        # writer keeps serving so later scores, flush() and close() still work
+        conn: Optional[sqlite3.Connection] = None
+        pending = self._queue
+        running = True
+        while running:
+            batch = [pending.get()]
+            while len(batch) < self.BATCH:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [score for score in batch if score is not None]
+            running = len(rows) == len(batch)
+            try:
+                if rows:
+                    if conn is None:
+                        conn = self._connect()
+                    with conn:
+                        conn.executemany(f"INSERT INTO scores ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as error:
+                self.failed += len(rows)
+                print(f"leaderboard: could not save {len(rows)} score(s) to {self.path}: {error}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    pending.task_done()
+        if conn is not None:
+            conn.close()
+
+    def top(self, k: int = 10) -> List[Score]:
+        rows = self._conn.execute(f"SELECT {COLUMNS} FROM scores ORDER BY score DESC LIMIT ?", (k,))
+        return [Score(*row) for row in rows]
+
+    def player_top(self, player: str, k: int = 10) -> List[Score]:
+        rows = self._conn.execute(f"SELECT {COLUMNS} FROM scores WHERE player = ? ORDER BY score DESC LIMIT ?",
+            (player, k))
+        return [Score(*row) for row in rows]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+def format_score(place: int, score: Score) -> str:
+    return f"{place:2}. {score.player[:10]:10} {score.score:7} L{score.level:<2} {score.lines:4} lines"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the Tetris leaderboard.")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH, help=f"score database (default {DEFAULT_PATH})")
+    parser.add_argument("--top", type=int, default=10, help="how many scores to list")
+    parser.add_argument("--player", default=None, help="only this player's scores")
+    args = parser.parse_args()
+
+    board = Leaderboard(args.path)
+    start = time.perf_counter()
+    scores = board.top(args.top) if args.player is None else board.player_top(args.player, args.top)
+    elapsed = time.perf_counter() - start
+    for place, score in enumerate(scores, 1):
+        print(format_score(place, score))
+    print(f"{len(scores)} of {len(board)} games in {elapsed * 1000:.2f}ms")
+    board.close()
+
+
+if __name__ == "__main__":
+    main()
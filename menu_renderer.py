@@ -1,18 +1,22 @@
 import pygame
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from color import Color
 from tile import Tile
-from utils import Utils
+from utils import Assets
+from utils import TextCache
 
 
 class MenuRenderer:
-    FONT_PATH = Utils.resource_path("assets/fonts/ttf/JetBrainsMono-Regular.ttf")
+    TITLE_FONT_SIZE = 52
+    OPTION_FONT_SIZE = 36
+    SCORE_FONT_SIZE = 22
 
-    def __init__(self, size: Tuple[int, int]):
+    def __init__(self, size: Tuple[int, int], text_cache: Optional[TextCache] = None,
+        assets: Optional[Assets] = None):
         self.size = size
-        self.title_font = pygame.font.Font(self.FONT_PATH, 52)
-        self.option_font = pygame.font.Font(self.FONT_PATH, 36)
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        self.assets = assets if assets is not None else Assets()
         self.options = [
             "New Game",
             "Resume Game",
@@ -21,10 +25,55 @@ class MenuRenderer:
         ]
 
         self.tile_size = 32
-
-
-    def draw(self, surface: pygame.Surface, cells: List[Tile], show_resume: bool):
-        self._draw_background(surface, cells)
+        # Leaderboard lines shown in place of the options, None while the options are up
+        self.scores: Optional[Tuple[str, ...]] = None
+
+        # Background tiles, overlay and text composited once per menu grid / option set
+        self._frame: Optional[pygame.Surface] = None
+        self._frame_key = None
+        self._needs_present = True
+
+    @property
+    def title_font(self) -> pygame.font.Font:
+        return self.assets.font(self.TITLE_FONT_SIZE)
+
+    @property
+    def option_font(self) -> pygame.font.Font:
+        return self.assets.font(self.OPTION_FONT_SIZE)
+
+    @property
+    def score_font(self) -> pygame.font.Font:
+        return self.assets.font(self.SCORE_FONT_SIZE)
+
+    def show_scores(self, lines: List[str]):
+        self.scores = tuple(lines)
+
+    def hide_scores(self):
+        self.scores = None
+
+    def invalidate(self):
+        self._needs_present = True
+
+    def draw(self, surface: pygame.Surface, grid, show_resume: bool) -> List[pygame.Rect]:
+        key = (grid, grid.version, show_resume, self.scores)
+        if key != self._frame_key:
+            self._frame_key = key
+            self._compose(grid.cells, show_resume)
+            self._needs_present = True
+
+        if not self._needs_present:
+            return []
+        self._needs_present = False
+        surface.blit(self._frame, (0, 0))
+        return [surface.get_rect()]
+
+    def _compose(self, cells: List[Tile], show_resume: bool):
+        if self._frame is None:
+            self._frame = pygame.Surface(self.size)
+        self._draw_background(self._frame, cells)
+        if self.scores is not None:
+            self._draw_scores(self._frame)
+            return
 
         labels = ["New Game"]
         if show_resume:
@@ -33,7 +82,7 @@ class MenuRenderer:
 
         # Build numbered strings with no gaps
         self.options = [f"{i + 1}.  {label}" for i, label in enumerate(labels)]
-        self._draw_centered_text(surface)
+        self._draw_centered_text(self._frame)
 
     def _draw_background(self, surface: pygame.Surface, cells: List[Tile]):
         w, h = self.size
@@ -62,14 +111,30 @@ class MenuRenderer:
         overlay.fill((0, 0, 0, 140))
         surface.blit(overlay, (0, 0))
 
+    def _draw_scores(self, surface: pygame.Surface):
+        w, h = self.size
+
+        title = self.text_cache.render(self.option_font, "HIGH SCORES", Color.WHITE)
+        surface.blit(title, title.get_rect(center=(w // 2, 120)))
+
+        lines = self.scores or ("No games yet",)
+        rendered = [self.text_cache.render(self.score_font, line, Color.WHITE) for line in lines]
+        rendered.append(self.text_cache.render(self.score_font, "Any key to go back", Color.GREEN))
+        line_h = self.score_font.get_linesize()
+        # Left-aligned as one block so the columns of the monospace font line up
+        left_x = (w - max(s.get_width() for s in rendered)) // 2
+        start_y = 180
+        for i, surf in enumerate(rendered):
+            surface.blit(surf, (left_x, start_y + i * (line_h + 6) + (line_h if i == len(rendered) - 1 else 0)))
+
     def _draw_centered_text(self, surface: pygame.Surface):
         w, h = self.size
 
-        title = self.title_font.render("TETRIS", True, Color.WHITE)
+        title = self.text_cache.render(self.title_font, "TETRIS", Color.WHITE)
         title_rect = title.get_rect(center=(w // 2, h // 2 - 160))
         surface.blit(title, title_rect)
 
-        rendered = [self.option_font.render(line, True, Color.WHITE) for line in self.options]
+        rendered = [self.text_cache.render(self.option_font, line, Color.WHITE) for line in self.options]
         if not rendered:
             return
 
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import argparse
+import random
+import time
+from collections import deque
+from typing import List, NamedTuple, Tuple
+
+from action import Action
+from placement_table import PlacementTable
+from shapes import Shape
+
+# Breadth-first search over (x, orientation, row) piece states using the same moves as Board:
+# shift, soft drop and rotate in place. Collision checks go through the precomputed placement
+# table and are memoised per state, so every state is tested against the grid at most once.
+
+
+class Landing(NamedTuple):
+    x: int
+    orientation: int
+    row: int
+    # Shortest input sequence from the start state; replay it with Board.apply
+    path: Tuple[Action, ...]
+
+
+# (action, dx, dy, orientation step) in the order BFS tries them
+MOVES = (
+    (Action.SOFT_DROP, 0, 1, 0),
+    (Action.LEFT, -1, 0, 0),
+    (Action.RIGHT, 1, 0, 0),
+    (Action.ROTATE_CW, 0, 0, -1),
+    (Action.ROTATE_CCW, 0, 0, 1),
+)
+
+UNKNOWN, FITS, BLOCKED = 0, 1, 2
+
+
+def reachable_placements(grid, table: PlacementTable, shape: Shape, origin: Tuple[int, int],
+    orientation: int) -> List[Landing]:
+    # Every resting state the piece can reach from origin/orientation, one per state
+    rows = grid.rows
+    width = table.cols - table.MIN_X
+    placements = table.for_shape(shape)
+    fits = grid.fits
+    min_x = table.MIN_X
+
+    # State id: (orientation * width + x - MIN_X) * rows + row
+    size = 4 * width * rows
+    collision = bytearray(size)
+    parent = [-1] * size
+    moved_by: List[Action] = [Action.SOFT_DROP] * size
+
+    x, row = origin
+    xi = x - min_x
+    if not (0 <= xi < width and 0 <= row < rows):
+        return []
+    placement = placements[orientation][xi]
+    if placement is None or not fits(placement, row):
+        return []
+    start = (orientation * width + xi) * rows + row
+    collision[start] = FITS
+
+    # The parent array doubles as the visited bitset; the start points at itself
+    parent[start] = start
+    queue = deque([(start, orientation, xi, row)])
+    landings: List[Tuple[int, int, int, int]] = []
+    while queue:
+        item = queue.popleft()
+        state, o, xi, row = item
+        for action, dx, dy, turn in MOVES:
+            nxi = xi + dx
+            nrow = row + dy
+            no = (o + turn) & 3
+            if 0 <= nxi < width and nrow < rows:
+                nstate = (no * width + nxi) * rows + nrow
+                known = collision[nstate]
+                if known == UNKNOWN:
+                    placement = placements[no][nxi]
+                    known = FITS if placement is not None and fits(placement, nrow) else BLOCKED
+                    collision[nstate] = known
+                if known == FITS:
+                    if parent[nstate] < 0:
+                        parent[nstate] = state
+                        moved_by[nstate] = action
+                        queue.append((nstate, no, nxi, nrow))
+                    continue
+            if dy:
+                landings.append(item)
+
+    result = []
+    for state, o, xi, row in landings:
+        path = []
+        node = state
+        while node != start:
+            path.append(moved_by[node])
+            node = parent[node]
+        path.reverse()
+        result.append(Landing(xi + min_x, o, row, tuple(path)))
+    return result
+
+
+def main():
+    from bit_grid import BitGrid
+    from board import Board
+    from headless import is_finished
+
+    parser = argparse.ArgumentParser(description="Benchmark the reachable-placement move generator.")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    # Random landings make ragged boards with plenty of overhangs to tuck under
+    rng = random.Random(args.seed)
+    board = Board(grid_cls=BitGrid, seed=args.seed)
+    enumerations = 0
+    landings = 0
+    elapsed = 0.0
+    for _ in range(args.games):
+        board.new_game()
+        while not is_finished(board):
+            start = time.perf_counter()
+            found = board.reachable_placements()
+            elapsed += time.perf_counter() - start
+            enumerations += 1
+            landings += len(found)
+            if not found:
+                break
+            for action in rng.choice(found).path:
+                board.apply(action)
+            board.hard_drop()
+
+    print(f"enumerations: {enumerations}  landings: {landings} ({landings / max(enumerations, 1):.1f} each)")
+    print(f"elapsed: {elapsed:.3f}s  enumerations/s: {enumerations / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from shapes import Shape
 
 class Piece():
 
+     __slots__ = ("_shape", "_origin", "_orientation")
+
      def __init__(self, shape: Shape, origin: tuple[int, int] = (3, 0), orientation: int = 0):
          self._shape = shape
          self._origin = origin
@@ -26,3 +28,37 @@ class Piece():
      @orientation.setter    
      def orientation(self, value):
          self._orientation = value
+
+
+# Read-only view of the active piece sitting on its landing row, so the shadow never copies the shape
+class ShadowPiece():
+
+     __slots__ = ("_piece", "_row")
+
+     def __init__(self, piece: Piece, row: int = 0):
+         self._piece = piece
+         self._row = row
+
+     @property
+     def piece(self):
+         return self._piece
+
+     @piece.setter
+     def piece(self, value):
+         self._piece = value
+
+     @property
+     def shape(self):
+         return self._piece.shape
+
+     @property
+     def origin(self):
+         return (self._piece.origin[0], self._row)
+
+     @origin.setter
+     def origin(self, value):
+         self._row = value[1]
+
+     @property
+     def orientation(self):
+         return self._piece.orientation
@@ -1,15 +1,42 @@
+import copy
 import random
+from typing import Optional, Sequence
 
-from shapes import Shape, IShape, JShape, LShape, OShape, SShape, TShape, ZShape
+from shapes import Shape, SHAPES
 
 class PieceBag:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random.Random()
+        # Set while the rng is shared with a copy(); whichever bag refills first takes its own copy
+        self._rng_shared = False
+        self.refills = 0
         self.bag = []
         self._refill()
 
+    @classmethod
+    def resume(cls, rng: random.Random, refills: int, bag: Sequence[Shape]) -> "PieceBag":
+        # Rebuilds a bag from a fresh rng by redrawing the first `refills` bags
+        resumed = cls(rng)
+        while resumed.refills < refills:
+            resumed._refill()
+        resumed.bag = list(bag)
+        return resumed
+
+    def copy(self) -> "PieceBag":
+        other = PieceBag.__new__(PieceBag)
+        other.rng = self.rng
+        other.bag = list(self.bag)
+        other.refills = self.refills
+        other._rng_shared = self._rng_shared = True
+        return other
+
     def _refill(self):
-        self.bag = [IShape(), JShape(), LShape(), OShape(), SShape(), TShape(), ZShape()]
-        random.shuffle(self.bag)
+        if self._rng_shared:
+            self.rng = copy.copy(self.rng)
+            self._rng_shared = False
+        self.bag = list(SHAPES)
+        self.rng.shuffle(self.bag)
+        self.refills += 1
 
     def next(self) -> Shape:
         if len(self.bag) == 0:
@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from shapes import Shape, SHAPES
+
+
+class Placement(NamedTuple):
+    # Flat cell offsets from the start of the origin row: row_offset * cols + col
+    indices: Tuple[int, ...]
+    # (col, row offset) of each cell, cols absolute for this origin column
+    cells: Tuple[Tuple[int, int], ...]
+    left: int
+    right: int
+    top: int
+    bottom: int
+    # (col, lowest row offset) for every column the piece covers
+    skyline: Tuple[Tuple[int, int], ...]
+    # (row offset, bitmask over absolute cols)
+    row_masks: Tuple[Tuple[int, int], ...]
+
+
+def build_placement(cells: Sequence[int], x: int, cols: int) -> Optional[Placement]:
+    offsets = [(x + cell % 4, cell // 4) for cell in cells]
+    left = min(col for col, _ in offsets)
+    right = max(col for col, _ in offsets)
+    if left < 0 or right >= cols:
+        return None
+
+    skyline: Dict[int, int] = {}
+    row_masks: Dict[int, int] = {}
+    for col, row in offsets:
+        skyline[col] = max(skyline.get(col, row), row)
+        row_masks[row] = row_masks.get(row, 0) | (1 << col)
+
+    return Placement(
+        indices=tuple(row * cols + col for col, row in offsets),
+        cells=tuple(offsets),
+        left=left,
+        right=right,
+        top=min(row for _, row in offsets),
+        bottom=max(row for _, row in offsets),
+        skyline=tuple(sorted(skyline.items())),
+        row_masks=tuple(sorted(row_masks.items())),
+    )
+
+
+class PlacementTable:
+
+    # Origins can sit left of column 0 when a shape's first column is empty
+    MIN_X = -3
+
+    def __init__(self, cols: int):
+        self.cols = cols
+        # Keyed by id() of the class-level SHAPE tuples, which every instance of a shape shares
+        self._tables: Dict[int, Tuple[Sequence[Sequence[int]], List[List[Optional[Placement]]]]] = {}
+        for shape in SHAPES:
+            self._add(shape.shape_lists)
+
+    def _add(self, shape_lists: Sequence[Sequence[int]]) -> List[List[Optional[Placement]]]:
+        table = [[build_placement(cells, x, self.cols) for x in range(self.MIN_X, self.cols)] for cells in shape_lists]
+        self._tables[id(shape_lists)] = (shape_lists, table)
+        return table
+
+    def for_shape(self, shape: Shape) -> List[List[Optional[Placement]]]:
+        entry = self._tables.get(id(shape.shape_lists))
+        if entry is None or entry[0] is not shape.shape_lists:
+            return self._add(shape.shape_lists)
+        return entry[1]
+
+    def get(self, shape: Shape, orientation: int, x: int) -> Optional[Placement]:
+        i = x - self.MIN_X
+        if i < 0 or i >= self.cols - self.MIN_X:
+            return None
+        return self.for_shape(shape)[orientation][i]
+
+
+@lru_cache(maxsize=None)
+def placement_table(cols: int) -> PlacementTable:
+    return PlacementTable(cols)
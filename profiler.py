@@ -0,0 +1,138 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Per-frame phase timings with rolling percentiles. A disabled profiler hands out one shared
+# no-op context and installs no wrappers, so leaving the calls in the main loop is free.
+
+_NULL_SECTION = nullcontext()
+
+
+def percentiles(samples: Iterable[float], points: Sequence[int]) -> Tuple[float, ...]:
+    # Nearest-rank percentiles; zeros when there are no samples yet
+    ordered = sorted(samples)
+    if not ordered:
+        return tuple(0.0 for _ in points)
+    last = len(ordered) - 1
+    return tuple(ordered[min(last, (len(ordered) * p + 99) // 100 - 1)] for p in points)
+
+
+class _Section:
+
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.add(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, enabled: bool = False, window: int = 600, trace_limit: int = 100000):
+        self.enabled = enabled
+        # Frames kept per phase for the rolling percentiles
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._frame: Optional[Dict[str, float]] = None
+        self._frame_start = 0.0
+        self.frame_count = 0
+        # (frame number, start time, phase seconds) for the trace dump, oldest dropped first
+        self.frames: Deque[Tuple[int, float, Dict[str, float]]] = deque(maxlen=trace_limit)
+
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add(self, name: str, seconds: float):
+        # Repeated phases (several logic ticks, say) add up within the frame
+        frame = self._frame
+        if frame is not None:
+            frame[name] = frame.get(name, 0.0) + seconds
+
+    def wrap(self, obj, attr: str, name: str):
+        # Times obj.attr as a sub-phase by shadowing the method on that one instance
+        if not self.enabled:
+            return
+        method = getattr(obj, attr)
+        add = self.add
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                add(name, perf_counter() - start)
+
+        setattr(obj, attr, timed)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        frame = self._frame
+        if frame is None:
+            return
+        self._frame = None
+        frame["total"] = time.perf_counter() - self._frame_start
+        for name, seconds in frame.items():
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+        self.frames.append((self.frame_count, self._frame_start, frame))
+        self.frame_count += 1
+
+    @property
+    def phases(self) -> List[str]:
+        return list(self._samples)
+
+    def percentiles(self, name: str) -> Tuple[float, ...]:
+        # Seconds over the rolling window
+        return percentiles(self._samples.get(name, ()), self.PERCENTILES)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for name, samples in self._samples.items():
+            stats = {f"p{p}": value for p, value in zip(self.PERCENTILES, self.percentiles(name))}
+            stats["mean"] = sum(samples) / len(samples)
+            stats["count"] = len(samples)
+            summary[name] = stats
+        return summary
+
+    def dump(self, path: str):
+        # CSV gets one row per frame in milliseconds; anything else gets JSON with the summary too
+        phases = self.phases
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "time", *phases])
+                for number, start, frame in self.frames:
+                    writer.writerow([number, f"{start:.6f}", *(f"{frame[name] * 1000:.4f}" if name in frame else ""
+                        for name in phases)])
+            return
+
+        with open(path, "w") as f:
+            json.dump({
+                "unit": "s",
+                "summary": self.summary(),
+                "frames": [{"frame": number, "time": start, **frame} for number, start, frame in self.frames],
+            }, f)
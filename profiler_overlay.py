@@ -0,0 +1,63 @@
+import time
+import pygame
+from typing import List, Optional, Tuple
+
+from color import Color
+from input_latency import InputLatency
+from profiler import Profiler
+from utils import Assets
+
+
+class ProfilerOverlay:
+
+    FONT_SIZE = 12
+    # Seconds between text refreshes; the cached panel is re-blitted every frame in between
+    REFRESH = 0.5
+    PADDING = 4
+
+    def __init__(self, profiler: Profiler, pos: Tuple[int, int], latency: Optional[InputLatency] = None,
+        assets: Optional[Assets] = None):
+        self.profiler = profiler
+        self.latency = latency
+        self.pos = pos
+        self.assets = assets if assets is not None else Assets()
+        self.visible = True
+        self._panel: Optional[pygame.Surface] = None
+        self._next_refresh = 0.0
+
+    @property
+    def font(self) -> pygame.font.Font:
+        return self.assets.font(self.FONT_SIZE)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._next_refresh = 0.0
+
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
+        if not self.visible:
+            return []
+        now = time.perf_counter()
+        if self._panel is None or now >= self._next_refresh:
+            self._next_refresh = now + self.REFRESH
+            self._panel = self._compose()
+        # Renderers may have painted over the panel since, so it goes back on every frame
+        return [surface.blit(self._panel, self.pos)]
+
+    def _compose(self) -> pygame.Surface:
+        lines = ["phase ms    p50   p95   p99"]
+        for name in self.profiler.phases:
+            p50, p95, p99 = self.profiler.percentiles(name)
+            lines.append(f"{name[:9]:9} {p50 * 1000:5.2f} {p95 * 1000:5.2f} {p99 * 1000:5.2f}")
+        if self.latency is not None:
+            for name, stats in self.latency.stats().items():
+                lines.append(f"in.{name[:6]:6} {stats['p50'] * 1000:5.1f} {stats['p95'] * 1000:5.1f} "
+                    f"{stats['p99'] * 1000:5.1f}")
+
+        rendered = [self.font.render(line, True, Color.WHITE) for line in lines]
+        line_h = self.font.get_linesize()
+        width = max(text.get_width() for text in rendered) + 2 * self.PADDING
+        panel = pygame.Surface((width, line_h * len(rendered) + 2 * self.PADDING))
+        panel.fill(Color.BLACK)
+        for i, text in enumerate(rendered):
+            panel.blit(text, (self.PADDING, self.PADDING + i * line_h))
+        return panel
@@ -1,14 +1,15 @@
 import pygame
-from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from color import Color
 from game_stats import GameStats
+from grid import Grid
 from piece import Piece
 from shapes import Shape
-from tile import Tile
+from tile_atlas import TileAtlas
+from utils import Assets
 from utils import GameState
-from utils import Utils
+from utils import TextCache
 
 class BoardRenderer:
 
@@ -17,23 +18,41 @@ class BoardRenderer:
     TILE_SIZE = 32
     PREVIEW_TILE_SIZE = 24
     PREVIEW_ORIGIN = (1, 1)
-
-    FONT_PATH = Utils.resource_path("assets/fonts/ttf/JetBrainsMono-Regular.ttf")
-
-    def __init__(self, size: tuple, cols: int, rows: int):
-        self.font = pygame.font.Font(self.FONT_PATH, 18)
-        self.game_over_font = pygame.font.Font(self.FONT_PATH, 40)
+    # Largest window onto the board that fits left of the preview; bigger boards scroll
+    MAX_VIEW_COLS = 12
+    MAX_VIEW_ROWS = 20
+    # Rows above the visible field; they draw over the top inset, as spawning pieces do
+    HIDDEN_ROWS = 2
+
+    FONT_SIZE = 18
+    GAME_OVER_FONT_SIZE = 40
+
+    def __init__(self, size: tuple, cols: int, rows: int, text_cache: Optional[TextCache] = None,
+        assets: Optional[Assets] = None):
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        # Fonts come from the shared assets the first time a game is drawn, not at construction
+        self.assets = assets if assets is not None else Assets()
+        self.size = size
         self.cols = cols
         self.rows = rows
         self._show_shadow = True
         self._game_state: GameState = GameState.PLAY
-        self.border_coords = (self.INSET - 3, self.INSET, 326, 645)
+        # Viewport in cells: its size, and the board column/row drawn at its top-left corner
+        self.view_cols = min(cols, self.MAX_VIEW_COLS)
+        self.view_rows = min(rows - self.HIDDEN_ROWS, self.MAX_VIEW_ROWS)
+        self.view_col = 0
+        self.view_row = 0
+        self.border_coords = (self.INSET - 3, self.INSET, self.view_cols * self.TILE_SIZE + 6,
+            self.view_rows * self.TILE_SIZE + 5)
         self.border_rect = pygame.Rect(self.border_coords)
         self.preview_coords = ((2 * size[0] // 3) + self.INSET, self.INSET, 125, 125)
         self.preview_rect = pygame.Rect(self.preview_coords)
         self.level_label_pos = ((2 * size[0] // 3) + self.INSET, self.INSET + 125 + 10)
         self.lines_cleared_label_pos = ((2 * size[0] // 3) + self.INSET, self.INSET + 125 + 30)
         self.score_label_pos = ((2 * size[0] // 3) + self.INSET, self.INSET + 125 + 50)
+        self.preview_area = self.preview_rect.union(pygame.Rect(self.preview_rect.x + 10, self.preview_rect.y + 10,
+            (self.PREVIEW_ORIGIN[0] + 4) * self.PREVIEW_TILE_SIZE, (self.PREVIEW_ORIGIN[1] + 4) * self.PREVIEW_TILE_SIZE))
+        self._stats_rect: Optional[pygame.Rect] = None
 
         self.game_over_rect = pygame.Rect((0, 0), (int(self.border_rect.w * 0.75), int(self.border_rect.h * 0.25)))
         self.game_over_rect.centerx = self.border_rect.centerx
@@ -43,114 +62,192 @@ class BoardRenderer:
 
         # Layout / rects (you can pass these in instead if you prefer)
         self.grid_origin_px = (self.INSET, 0 - self.TILE_SIZE)
+        self.cells_rect = pygame.Rect(self.grid_origin_px, (self.view_cols * self.TILE_SIZE,
+            (self.view_rows + self.HIDDEN_ROWS) * self.TILE_SIZE))
+        # Pieces are clipped to the viewport only when it scrolls; a board that fits draws as it always has
+        self._view_clip = None if (self.view_cols, self.view_rows + self.HIDDEN_ROWS) == (cols, rows) \
+            else self.cells_rect
+
+        # Locked cells in the viewport are rendered once per grid change or scroll and blitted from
+        # here; the pieces are erased by copying back the matching area of this surface
+        self._cells_surface = pygame.Surface(self.cells_rect.size)
+        self._cells_key = None
+        # Pre-rendered tiles for every colour and style, built on the first draw
+        self._atlas: Optional[TileAtlas] = None
+        self._piece_rects: List[pygame.Rect] = []
+        self._preview_shape: Optional[Shape] = None
+        # Set by the board's STATS_CHANGED events; stats are only re-read when it is
+        self._stats_dirty = True
+        self._full_redraw = True
+
+    @property
+    def font(self) -> pygame.font.Font:
+        return self.assets.font(self.FONT_SIZE)
+
+    @property
+    def game_over_font(self) -> pygame.font.Font:
+        return self.assets.font(self.GAME_OVER_FONT_SIZE)
+
+    @property
+    def stats_rect(self) -> pygame.Rect:
+        # Sized by the font's line height, so worked out once the font is needed anyway
+        if self._stats_rect is None:
+            self._stats_rect = pygame.Rect(self.level_label_pos, (self.size[0] - self.level_label_pos[0],
+                self.score_label_pos[1] - self.level_label_pos[1] + self.font.get_linesize()))
+        return self._stats_rect
+
+    @property
+    def atlas(self) -> TileAtlas:
+        if self._atlas is None:
+            self._atlas = TileAtlas(Grid.PALETTE[1:], {
+                "normal": (self.TILE_SIZE, 0.5, 1.0),
+                "shadow": (self.TILE_SIZE, 0.35, 0.5),
+                "preview": (self.PREVIEW_TILE_SIZE, 0.5, 1.0),
+            })
+        return self._atlas
 
     def toggle_shadow(self):
         self._show_shadow = not self._show_shadow
 
     def set_game_state(self, value=GameState.MENU):
+        if value != self._game_state:
+            self._full_redraw = True
         self._game_state = value
 
-    def draw(self, surface: pygame.Surface, cells: List[Tile], active_piece: Piece, shadow_piece: Piece, 
-        next_piece: Shape, stats: GameStats):
-        self._draw_cells(surface, cells)
+    def invalidate(self):
+        self._full_redraw = True
+
+    def on_stats_changed(self, event):
+        self._stats_dirty = True
+
+    def draw(self, surface: pygame.Surface, grid, active_piece: Piece, shadow_piece: Piece,
+        next_piece: Shape, stats: GameStats) -> List[pygame.Rect]:
+        self._follow(active_piece)
+        cells_changed = self._update_cells(grid)
+        full_redraw = self._full_redraw
+        if full_redraw:
+            self._full_redraw = False
+            self._preview_shape = None
+            self._stats_dirty = True
+            surface.fill(Color.BLACK)
+            pygame.draw.rect(surface, self.BG_COLOR, self.preview_rect, 2, border_radius=1)
+            cells_changed = True
+
+        dirty: List[pygame.Rect] = []
+        if cells_changed:
+            surface.blit(self._cells_surface, self.grid_origin_px)
+            dirty.append(self.cells_rect.clip(surface.get_rect()))
+        else:
+            gx, gy = self.grid_origin_px
+            for rect in self._piece_rects:
+                # A freshly spawned shadow can sit below the grid for a frame, off the cached surface
+                surface.fill(Color.BLACK, rect)
+                surface.blit(self._cells_surface, rect, rect.move(-gx, -gy))
+            dirty.extend(self._piece_rects)
+        self._piece_rects = []
+
+        if self._stats_dirty:
+            # Clearing the stats block clips the bottom of tall previews, so redraw both
+            self._preview_shape = None
+
         pygame.draw.rect(surface, self.BG_COLOR, self.border_rect, 2, border_radius=1)
-        pygame.draw.rect(surface, self.BG_COLOR, self.preview_rect, 2, border_radius=1)
 
         if self._game_state == GameState.PLAY:
-            if self._show_shadow:
-                self._draw_shadow_piece(surface, shadow_piece)
-            self._draw_active_piece(surface, active_piece)
-            self._draw_preview(surface, next_piece)
-        elif self._game_state == GameState.DONE:
+            # Shadow and active piece go out in one batch, the shadow first so the piece covers it
+            blits = self._piece_blits(shadow_piece, "shadow") if self._show_shadow else []
+            blits += self._piece_blits(active_piece, "normal")
+            surface.set_clip(self._view_clip)
+            self._piece_rects = surface.blits(blits)
+            surface.set_clip(None)
+            dirty.extend(self._piece_rects)
+            if next_piece is not self._preview_shape:
+                self._preview_shape = next_piece
+                self._draw_preview(surface, next_piece)
+                dirty.append(self.preview_area)
+                self._stats_dirty = True
+        elif self._game_state == GameState.DONE and cells_changed:
             pygame.draw.rect(surface, Color.BLACK, self.game_over_rect)
-            text_surf = self.game_over_font.render("Game Over!", True, Color.RED)
+            text_surf = self.text_cache.render(self.game_over_font, "Game Over!", Color.RED)
             text_rect = text_surf.get_rect()
             text_rect.center = self.game_over_rect.center
             surface.blit(text_surf, text_rect)
 
-        self._draw_stats(surface, stats)
-
-    def _shade(self, rgb, factor: float = 0.5) -> pygame.Color:
-        return pygame.Color(int(rgb[0] * factor), int(rgb[1] * factor), int(rgb[2] * factor))
-
-    def _draw_cells(self, surface: pygame.Surface, cells: List[Tile]):
-        for idx, tile in enumerate(cells):
-            col = idx % self.cols
-            row = idx // self.cols
-
-            x = col * self.TILE_SIZE + self.INSET
-            y = (row * self.TILE_SIZE) - self.TILE_SIZE
-            rect = pygame.Rect(x, y, self.TILE_SIZE, self.TILE_SIZE)
-
-            if tile.color is not Color.BLACK:
-                fill = self._shade(tile.color, 0.5)
-                pygame.draw.rect(surface, fill, rect)
-                pygame.draw.rect(surface, tile.color, rect, 2, border_radius=2)
-
-    def _draw_shadow_piece(self, surface: pygame.Surface, piece: Shape):
+        if self._stats_dirty:
+            self._stats_dirty = False
+            self._draw_stats(surface, stats)
+            dirty.append(self.stats_rect)
+
+        if full_redraw:
+            return [surface.get_rect()]
+        return dirty
+
+    def _follow(self, piece: Piece):
+        # Scroll just enough to keep the piece's 4x4 box on screen
+        x, y = piece.origin
+        col = min(self.view_col, x)
+        col = max(col, x + 4 - self.view_cols)
+        self.view_col = max(0, min(col, self.cols - self.view_cols))
+
+        shown = self.view_rows + self.HIDDEN_ROWS
+        row = min(self.view_row, y - self.HIDDEN_ROWS)
+        row = max(row, y + 4 - shown)
+        self.view_row = max(0, min(row, self.rows - shown))
+
+    def _update_cells(self, grid) -> bool:
+        key = (grid, grid.version, self.view_col, self.view_row)
+        if key == self._cells_key:
+            return False
+        self._cells_key = key
+        self._draw_cells(self._cells_surface, grid)
+        return True
+
+    def _draw_cells(self, surface: pygame.Surface, grid):
+        # Only the viewport is read, so the cost does not grow with the board
+        surface.fill(Color.BLACK)
+        get_color = grid.get_color
+        size = self.TILE_SIZE
+        atlas = self.atlas.surface
+        areas = self.atlas.areas("normal")
+        blits = []
+        for y, row in enumerate(range(self.view_row, self.view_row + self.view_rows + self.HIDDEN_ROWS)):
+            for x, col in enumerate(range(self.view_col, self.view_col + self.view_cols)):
+                color = get_color(col, row)
+                if color != Color.BLACK:
+                    blits.append((atlas, (x * size, y * size), areas[color]))
+        surface.blits(blits, doreturn=False)
+
+    def _piece_blits(self, piece: Piece, style: str) -> list:
         ox, oy = piece.origin
-        for cell in range(16):
-            if cell in piece.shape.get_shape(piece.orientation):
-                col = ox + (cell % 4)
-                row = oy + (cell // 4)
-
-                x = (col * self.TILE_SIZE) + self.grid_origin_px[0]
-                y = (row * self.TILE_SIZE) + self.grid_origin_px[1]
-                rect = pygame.Rect(x, y, self.TILE_SIZE, self.TILE_SIZE)
-
-                fill = self._shade(piece.shape.color, 0.35)
-                outline = self._shade(piece.shape.color, 0.5)
-                pygame.draw.rect(surface, fill, rect)
-                pygame.draw.rect(surface, outline, rect, 2, border_radius=2)
-
-    def _draw_active_piece(self, surface: pygame.Surface, piece: Piece):
-        ox, oy = piece.origin
-        for cell in range(16):
-            if cell in piece.shape.get_shape(piece.orientation):
-                col = ox + (cell % 4)
-                row = oy + (cell // 4)
-
-                x = (col * self.TILE_SIZE) + self.grid_origin_px[0]
-                y = (row * self.TILE_SIZE) + self.grid_origin_px[1]
-                rect = pygame.Rect(x, y, self.TILE_SIZE, self.TILE_SIZE)
-
-                fill = self._shade(piece.shape.color, 0.5)
-                pygame.draw.rect(surface, fill, rect)
-                pygame.draw.rect(surface, piece.shape.color, rect, 2, border_radius=2)
+        ox = (ox - self.view_col) * self.TILE_SIZE + self.grid_origin_px[0]
+        oy = (oy - self.view_row) * self.TILE_SIZE + self.grid_origin_px[1]
+        atlas = self.atlas.surface
+        area = self.atlas.areas(style)[piece.shape.color]
+        size = self.TILE_SIZE
+        return [(atlas, (ox + (cell % 4) * size, oy + (cell // 4) * size), area)
+            for cell in piece.shape.get_shape(piece.orientation)]
 
     def _draw_preview(self, surface: pygame.Surface, shape: Shape):
         ox, oy = self.PREVIEW_ORIGIN
 
         # center inside preview_rect (simple version)
-        base_x = self.preview_rect.x + 10
-        base_y = self.preview_rect.y + 10
-
-        for cell in range(16):
-            if cell in shape.get_shape(0):
-                col = ox + (cell % 4)
-                row = oy + (cell // 4)
+        base_x = self.preview_rect.x + 10 + ox * self.PREVIEW_TILE_SIZE
+        base_y = self.preview_rect.y + 10 + oy * self.PREVIEW_TILE_SIZE
 
-                x = base_x + (col * self.PREVIEW_TILE_SIZE)
-                y = base_y + (row * self.PREVIEW_TILE_SIZE)
-                rect = pygame.Rect(x, y, self.PREVIEW_TILE_SIZE, self.PREVIEW_TILE_SIZE)
-
-                fill = self._shade(shape.color, 0.5)
-                pygame.draw.rect(surface, fill, rect)
-                pygame.draw.rect(surface, shape.color, rect, 2, border_radius=2)
+        surface.fill(Color.BLACK, self.preview_area)
+        pygame.draw.rect(surface, self.BG_COLOR, self.preview_rect, 2, border_radius=1)
+        atlas = self.atlas.surface
+        area = self.atlas.areas("preview")[shape.color]
+        size = self.PREVIEW_TILE_SIZE
+        surface.blits([(atlas, (base_x + (cell % 4) * size, base_y + (cell // 4) * size), area)
+            for cell in shape.get_shape(0)], doreturn=False)
 
     def _draw_stats(self, surface: pygame.Surface, stats):
-        level_label = self.font.render("Level:", True, Color.GREEN)
-        level_value = self.font.render(str(stats.level), True, Color.WHITE)
-        rect = surface.blit(level_label, self.level_label_pos)
-        surface.blit(level_value, (rect.x + rect.width + 5, rect.y))
-
-        lines_label = self.font.render("Lines:", True, Color.GREEN)
-        lines_value = self.font.render(str(stats.lines_cleared), True, Color.WHITE)
-        rect = surface.blit(lines_label, self.lines_cleared_label_pos)
-        surface.blit(lines_value, (rect.x + rect.width + 5, rect.y))
-
-        score_label = self.font.render("Score:", True, Color.GREEN)
-        score_value = self.font.render(str(stats.score), True, Color.WHITE)
-        rect = surface.blit(score_label, self.score_label_pos)
-        surface.blit(score_value, (rect.x + rect.width + 5, rect.y))
-
+        surface.fill(Color.BLACK, self.stats_rect)
+        self._draw_stat(surface, "Level:", stats.level, self.level_label_pos)
+        self._draw_stat(surface, "Lines:", stats.lines_cleared, self.lines_cleared_label_pos)
+        self._draw_stat(surface, "Score:", stats.score, self.score_label_pos)
+
+    def _draw_stat(self, surface: pygame.Surface, label: str, value: int, pos: Tuple[int, int]):
+        # Labels never change and values only on a lock, so both come straight from the cache
+        rect = surface.blit(self.text_cache.render(self.font, label, Color.GREEN), pos)
+        surface.blit(self.text_cache.render(self.font, str(value), Color.WHITE), (rect.x + rect.width + 5, rect.y))
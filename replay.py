@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import argparse
+import struct
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from action import Action
+from bit_grid import BitGrid
+from board import Board
+from grid import Grid
+from utils import GameState
+
+# Replay file: a fixed header, then one record per input and nothing else.
+#   header  magic, version, game seed, logic ticks per second, final tick, final score/lines/level,
+#           board cols/rows
+#   record  logic tick the input landed on (counted from new_game), Action value
+MAGIC = b"TRPL"
+VERSION = 2
+HEADER = struct.Struct("<4sBQHIIIIHH")
+RECORD = struct.Struct("<IB")
+
+
+class Replay(NamedTuple):
+    seed: int
+    logic_hz: int
+    end_tick: int
+    score: int
+    lines_cleared: int
+    level: int
+    inputs: List[Tuple[int, Action]]
+    size: Tuple[int, int] = Grid.GRID
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.seed, self.logic_hz, self.end_tick,
+            self.score, self.lines_cleared, self.level, *self.size))
+        for tick, action in self.inputs:
+            out += RECORD.pack(tick, action.value)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        magic, version, seed, logic_hz, end_tick, score, lines_cleared, level, cols, rows = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} replay")
+        inputs = [(tick, Action(value)) for tick, value in RECORD.iter_unpack(data[HEADER.size:])]
+        return cls(seed, logic_hz, end_tick, score, lines_cleared, level, inputs, (cols, rows))
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+
+    def __init__(self, seed: int, logic_hz: int, start_tick: int = 0, size: Tuple[int, int] = Grid.GRID):
+        self.seed = seed
+        self.logic_hz = logic_hz
+        self.start_tick = start_tick
+        self.size = size
+        self.inputs: List[Tuple[int, Action]] = []
+
+    def record(self, tick: int, action: Action):
+        self.inputs.append((tick - self.start_tick, action))
+
+    def finish(self, tick: int, board: Board) -> Replay:
+        stats = board.game_stats
+        return Replay(self.seed, self.logic_hz, tick - self.start_tick, stats.score, stats.lines_cleared,
+            stats.level, self.inputs, self.size)
+
+
+class ReplayPlayer:
+
+    def __init__(self, replay: Replay, grid_cls: type = BitGrid):
+        self.replay = replay
+        self.board = Board(grid_cls=grid_cls, size=replay.size)
+        self.tick = 0
+
+    def play(self, max_tick: Optional[int] = None) -> Board:
+        # Same order as App.run: all of a frame's logic ticks first, then the inputs stamped with that tick
+        end_tick = self.replay.end_tick if max_tick is None else min(max_tick, self.replay.end_tick)
+        step = 1.0 / self.replay.logic_hz
+        board = self.board
+        board.new_game(self.replay.seed)
+
+        for tick, action in self.replay.inputs:
+            if tick > end_tick:
+                break
+            while self.tick < tick:
+                board.update(step)
+                self.tick += 1
+            board.apply(action)
+
+        while self.tick < end_tick:
+            board.update(step)
+            self.tick += 1
+        return board
+
+    def matches(self) -> bool:
+        stats = self.board.game_stats
+        return (stats.score, stats.lines_cleared, stats.level) == \
+            (self.replay.score, self.replay.lines_cleared, self.replay.level)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast-forward a Tetris replay headlessly.")
+    parser.add_argument("path")
+    parser.add_argument("--repeat", type=int, default=1, help="play the replay this many times for timing")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        player = ReplayPlayer(replay)
+        board = player.play()
+    elapsed = time.perf_counter() - start
+
+    stats = board.game_stats
+    game_seconds = replay.end_tick / replay.logic_hz
+    print(f"seed: {replay.seed}  board: {replay.size[0]}x{replay.size[1]}  inputs: {len(replay.inputs)}  "
+        f"ticks: {replay.end_tick}")
+    print(f"score: {stats.score}  lines: {stats.lines_cleared}  level: {stats.level}  "
+        f"game over: {board.game_state != GameState.PLAY or board.is_game_over()}")
+    print(f"matches recording: {player.matches()}")
+    print(f"elapsed: {elapsed:.3f}s  speed: {game_seconds * args.repeat / elapsed:.0f}x real time")
+    if not player.matches():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
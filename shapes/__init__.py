@@ -7,6 +7,9 @@ from .s_shape import SShape
 from .t_shape import TShape
 from .z_shape import ZShape
 
+# Shared immutable instances of the seven tetrominoes
+SHAPES = (IShape(), JShape(), LShape(), OShape(), SShape(), TShape(), ZShape())
+
 __all__ = [
     "Shape",
     "IShape", 
@@ -16,4 +19,5 @@ __all__ = [
     "SShape",
     "TShape",
     "ZShape",
+    "SHAPES",
 ]
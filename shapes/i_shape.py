@@ -1,11 +1,13 @@
-from typing import List
+from typing import Tuple
 
 from color import Color
 from .shape import Shape
 
 class IShape(Shape):
 
-    SHAPE: List[List[int]] = [[0, 4, 8, 12], [0, 1, 2, 3], [0, 4, 8, 12], [0, 1, 2, 3]]
+    __slots__ = ()
+
+    SHAPE: Tuple[Tuple[int, ...], ...] = ((0, 4, 8, 12), (0, 1, 2, 3), (0, 4, 8, 12), (0, 1, 2, 3))
 
     def __init__(self):
         super().__init__(self.SHAPE, Color.LT_BLUE)
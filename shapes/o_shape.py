@@ -1,11 +1,13 @@
-from typing import List
+from typing import Tuple
 
 from color import Color
 from .shape import Shape
 
 class OShape(Shape):
 
-    SHAPE: List[List[int]] = [[0, 1, 4, 5], [0, 1, 4, 5], [0, 1, 4, 5], [0, 1, 4, 5]]
+    __slots__ = ()
+
+    SHAPE: Tuple[Tuple[int, ...], ...] = ((0, 1, 4, 5), (0, 1, 4, 5), (0, 1, 4, 5), (0, 1, 4, 5))
 
     def __init__(self):
         super().__init__(self.SHAPE, Color.YELLOW)
@@ -1,11 +1,13 @@
-from typing import List
+from typing import Tuple
 
 from color import Color
 from .shape import Shape
 
 class SShape(Shape):
 
-    SHAPE: List[List[int]] = [[1, 2, 4, 5], [0, 4, 5, 9], [1, 2, 4, 5], [0, 4, 5, 9]]
+    __slots__ = ()
+
+    SHAPE: Tuple[Tuple[int, ...], ...] = ((1, 2, 4, 5), (0, 4, 5, 9), (1, 2, 4, 5), (0, 4, 5, 9))
 
     def __init__(self):
         super().__init__(self.SHAPE, Color.GREEN)
@@ -1,27 +1,27 @@
-from typing import List
+from typing import Sequence, Tuple
 
 from color import Color
-from heading import Heading
 
+# Shapes are immutable and shared: the orientation tables are class-level tuples and the
+# seven tetrominoes are the singletons in shapes.SHAPES
 class Shape():
 
-    def __init__(self, shape_lists: List[List[int]], color: Color=Color.BLACK):
-        self.shape_lists = shape_lists
+    __slots__ = ("_shape_lists", "_color")
+
+    def __init__(self, shape_lists: Sequence[Sequence[int]], color: Color=Color.BLACK):
+        self._shape_lists = shape_lists
         self._color = color
-    
-    def get_shape(self, orientation) -> List[int]:
-        return self.shape_lists[orientation]
+
+    def get_shape(self, orientation) -> Tuple[int, ...]:
+        return self._shape_lists[orientation]
+
+    @property
+    def shape_lists(self) -> Sequence[Sequence[int]]:
+        return self._shape_lists
 
     @property
     def color(self) -> Color:
         return self._color
 
-    def set_shadow(self, is_shadow: bool=True):
-        self._color = Color.SHADOW_WHITE
-
-    def clone(self) -> "Shape":
-        return Shape(shape_lists = self.shape_lists, color = self._color)
-
     def __str__(self):
         return f"{self.__class__.__name__}"
-
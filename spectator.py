@@ -0,0 +1,96 @@
+import math
+import os
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+import pygame
+from typing import List, Optional, Sequence
+
+from board import Board
+from color import Color
+from grid import Grid
+
+
+class SpectatorView:
+
+    GAP = 2
+
+    def __init__(self, count: int, cols: int, rows: int, cell: int = 4, columns: Optional[int] = None):
+        # Boards laid out in a grid of tiles, one pixel block of `cell` size per board cell
+        self.count = count
+        self.cols = cols
+        self.rows = rows
+        self.cell = cell
+        self.columns = columns if columns is not None else math.ceil(math.sqrt(count))
+        self.tile_size = (cols * cell, rows * cell)
+        tile_rows = math.ceil(count / self.columns)
+        self.size = (self.columns * (self.tile_size[0] + self.GAP), tile_rows * (self.tile_size[1] + self.GAP))
+        # Each board becomes an 8-bit palette image of its colour codes, scaled up in one call
+        self._palette = list(Grid.PALETTE)
+        self._keys: List[Optional[tuple]] = [None] * count
+        # Scaled locked cells per board, rebuilt only when that grid changes
+        self._grids: List[Optional[tuple]] = [None] * count
+
+    def tile_rect(self, index: int) -> pygame.Rect:
+        row, col = divmod(index, self.columns)
+        w, h = self.tile_size
+        return pygame.Rect(col * (w + self.GAP), row * (h + self.GAP), w, h)
+
+    def invalidate(self):
+        self._keys = [None] * self.count
+
+    def draw(self, surface: pygame.Surface, boards: Sequence[Board]) -> List[pygame.Rect]:
+        # Repaints only the boards whose grid or active piece moved; returns their rects
+        dirty = []
+        for index, board in enumerate(boards):
+            piece = board.active_piece
+            key = (board.grid, board.grid.version, piece, piece.origin, piece.orientation)
+            if key == self._keys[index]:
+                continue
+            self._keys[index] = key
+            rect = surface.blit(self._grid_image(index, board), self.tile_rect(index))
+            self._draw_piece(surface, board, rect)
+            dirty.append(rect)
+        return dirty
+
+    def _grid_image(self, index: int, board: Board) -> pygame.Surface:
+        grid = board.grid
+        cached = self._grids[index]
+        if cached is not None and cached[0] is grid and cached[1] == grid.version:
+            return cached[2]
+        image = pygame.image.frombuffer(grid.to_bytes(), (self.cols, self.rows), "P")
+        image.set_palette(self._palette)
+        image = pygame.transform.scale(image, self.tile_size)
+        self._grids[index] = (grid, grid.version, image)
+        return image
+
+    def _draw_piece(self, surface: pygame.Surface, board: Board, rect: pygame.Rect):
+        piece = board.active_piece
+        x, y = piece.origin
+        placement = board.placements.get(piece.shape, piece.orientation, x)
+        if placement is None:
+            return
+        cell = self.cell
+        color = piece.shape.color
+        for col, row in placement.cells:
+            surface.fill(color, (rect.x + col * cell, rect.y + (row + y) * cell, cell, cell))
+
+
+class SpectatorWindow:
+
+    def __init__(self, count: int, cols: int, rows: int, cell: int = 4):
+        pygame.init()
+        self.view = SpectatorView(count, cols, rows, cell)
+        self.screen = pygame.display.set_mode(self.view.size)
+        pygame.display.set_caption(f"Tetris - {count} games")
+        self.screen.fill(Color.BLACK)
+        pygame.display.flip()
+
+    def draw(self, boards: Sequence[Board]) -> bool:
+        # False once the window has been closed
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return False
+        dirty = self.view.draw(self.screen, boards)
+        if dirty:
+            pygame.display.update(dirty)
+        return True
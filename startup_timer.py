@@ -0,0 +1,39 @@
+import sys
+import time
+from typing import List, Tuple
+
+from utils import Utils
+
+# Cold-start timing: named marks from the first line of the entry script to the first frame
+# on screen. Anything before that line (interpreter start, and a PyInstaller one-file build
+# unpacking itself) is not seen from inside the process and has to be timed from outside.
+
+
+class StartupTimer:
+
+    def __init__(self, start: float):
+        # start is a time.perf_counter() reading taken as early as the script can take it
+        self.start = start
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter()))
+
+    @property
+    def frozen(self) -> bool:
+        # PyInstaller sets sys.frozen and serves assets from sys._MEIPASS
+        return bool(getattr(sys, "frozen", False))
+
+    @property
+    def total(self) -> float:
+        return self.marks[-1][1] - self.start if self.marks else 0.0
+
+    def summary(self) -> str:
+        parts = []
+        previous = self.start
+        for name, at in self.marks:
+            parts.append(f"{name} {(at - previous) * 1000:.1f}ms")
+            previous = at
+        build = "frozen" if self.frozen else "source"
+        return (f"startup ({build} build, assets from {Utils.resource_path('')}): " + "  ".join(parts) +
+            f"  first frame after {self.total * 1000:.1f}ms")
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 
+import time
+STARTED = time.perf_counter()
+import argparse
 import os
+import sqlite3
+import sys
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
 import warnings
 warnings.filterwarnings(
@@ -9,71 +14,270 @@ warnings.filterwarnings(
     category=UserWarning,
 )
 import pygame
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from action import Action
+from bit_grid import BitGrid
 from board import Board
-from direction import Direction
-from heading import Heading
+from event_bus import BoardEvent
+from fixed_timestep import FixedTimestep
+from grid import parse_size
+from input_latency import InputLatency
+from leaderboard import DEFAULT_PATH
+from leaderboard import Leaderboard
+from leaderboard import Score
+from leaderboard import default_player
+from leaderboard import format_score
+from menu_renderer import MenuRenderer
+from profiler import Profiler
+from renderer import BoardRenderer
+from replay import ReplayRecorder
+from startup_timer import StartupTimer
+from telemetry import TelemetryLog
+from utils import Assets
 from utils import GameState
-from utils import Utils
+from utils import TextCache
+
+if TYPE_CHECKING:
+    # Imported for real only when profiling is on
+    from profiler_overlay import ProfilerOverlay
 
 class App:
     # Class-level constants, no globals
     WIDTH = 640
     HEIGHT = 736
     BG_COLOR = (0, 0, 0)
-    FPS = 60
+    FPS = 60                    # render rate
+    LOGIC_HZ = 120              # fixed simulation ticks per second
     KEY_REPEAT_DELAY = 400      # ms
     KEY_REPEAT_INTERVAL = 50    # ms
+    PROFILER_TOP = 260          # profiler overlay sits under the stats
+    PROFILER_WIDTH = 200
+    ICON = "assets/icons/app_icon.png"
+    HIGH_SCORES = 10            # leaderboard entries listed from the menu
+    # Queued events that end a low-latency wait early
+    INPUT_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN)
+
+    KEY_ACTIONS = {
+        pygame.K_LEFT: Action.LEFT,
+        pygame.K_RIGHT: Action.RIGHT,
+        pygame.K_DOWN: Action.SOFT_DROP,
+        pygame.K_SPACE: Action.HARD_DROP,
+        pygame.K_a: Action.ROTATE_CCW,
+        pygame.K_s: Action.ROTATE_CW,
+        pygame.K_g: Action.TOGGLE_SHADOW,
+    }
 
-    def __init__(self):
+    def __init__(self, render_fps: int = FPS, logic_hz: int = LOGIC_HZ, uncapped: bool = False,
+        seed: Optional[int] = None, record_path: Optional[str] = None, profile: bool = False,
+        profile_path: Optional[str] = None, trace_input: bool = False, low_latency: bool = False,
+        size: Optional[Tuple[int, int]] = None, startup: Optional[StartupTimer] = None,
+        leaderboard_path: Optional[str] = None, player: Optional[str] = None,
+        telemetry_path: Optional[str] = None, telemetry_gzip: bool = False):
 
         pygame.init()
 
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Tetris")
-        app_icon = pygame.image.load(Utils.resource_path("assets/icons/app_icon.png")).convert_alpha()
-        pygame.display.set_icon(app_icon)
+        # Fonts and images are shared by every renderer and only loaded when first drawn
+        self.assets = Assets()
+        # The icon is a large image to decode, so it is set once the first frame is up
+        self._icon_pending = True
         pygame.key.set_repeat(self.KEY_REPEAT_DELAY, self.KEY_REPEAT_INTERVAL)
+        # Set when only timing the cold start: the app quits once the first frame is presented
+        self.startup = startup
+        if startup is not None:
+            startup.mark("display")
 
         self.clock = pygame.time.Clock()
         self.is_running = True
         self.elapsed_time = 0.0
         self.display_time = 0.0
-        self.time_accumulator = 0.0
+        self.render_fps = render_fps
+        self.uncapped = uncapped
+        self.logic_hz = logic_hz
+        self.timestep = FixedTimestep(1.0 / logic_hz)
+        self._next_render = 0.0
+        self.low_latency = low_latency
+        self._frame_start = time.perf_counter()
+        self.record_path = record_path
+        self.recorder: Optional[ReplayRecorder] = None
+        # Set by board events that can end a game; the loop checks it instead of polling the board
+        self._game_may_have_ended = False
+        self.leaderboard: Optional[Leaderboard] = None
+        if leaderboard_path is not None:
+            try:
+                self.leaderboard = Leaderboard(leaderboard_path)
+            except sqlite3.Error as error:
+                print(f"leaderboard: cannot open {leaderboard_path} ({error}); scores will not be saved",
+                    file=sys.stderr)
+        self.player = player if player is not None else default_player()
+        # Logic ticks the current game has spent in play, paused time excluded; None once its
+        # score has been submitted
+        self._play_ticks: Optional[int] = None
+
+        # BitGrid keeps new_game cheap at large --size
+        self.board = Board(grid_cls=BitGrid, seed=seed, size=size)
+        screen_size = (self.WIDTH, self.HEIGHT)
+        text_cache = TextCache()
+        renderer = BoardRenderer(size=screen_size, cols=self.board.grid.cols, rows=self.board.grid.rows,
+            text_cache=text_cache, assets=self.assets)
+        menu_renderer = MenuRenderer(screen_size, text_cache=text_cache, assets=self.assets)
+        self.board.attach_renderers(renderer, menu_renderer)
+        self.menu_renderer = menu_renderer
+        self.board.events.subscribe(BoardEvent.PIECE_LOCKED, self._on_game_may_end)
+        self.board.events.subscribe(BoardEvent.STATE_CHANGED, self._on_game_may_end)
+        self.telemetry: Optional[TelemetryLog] = None
+        if telemetry_path is not None:
+            self.telemetry = TelemetryLog(telemetry_path, compress=telemetry_gzip)
+            self.telemetry.attach(self.board)
 
-        self.board = Board((self.WIDTH, self.HEIGHT))
+        self.profile_path = profile_path
+        self.profiler = Profiler(enabled=profile or profile_path is not None)
+        self.profiler.wrap(self.board, "find_shadow_pos", "shadow")
+        self.profiler.wrap(renderer, "_draw_cells", "cells")
+        self.profiler.wrap(renderer, "_draw_stats", "stats")
+        self.profiler.wrap(menu_renderer, "_draw_background", "menu_bg")
+        self.input_latency: Optional[InputLatency] = None
+        if trace_input or self.profiler.enabled:
+            self.input_latency = InputLatency()
+        self.trace_input = trace_input
+        self.overlay: Optional["ProfilerOverlay"] = None
+        if self.profiler.enabled:
+            from profiler_overlay import ProfilerOverlay
+            self.overlay = ProfilerOverlay(self.profiler, (self.WIDTH - self.PROFILER_WIDTH, self.PROFILER_TOP),
+                latency=self.input_latency, assets=self.assets)
+        if startup is not None:
+            startup.mark("app")
 
     def run(self):
+        start = time.perf_counter()
+        profiler = self.profiler
         while self.is_running:
-            dt = self.clock.tick(self.FPS) / 1000.0
-            self.elapsed_time += dt
-            if self.board.game_state == GameState.PLAY and not self.board.is_game_over():
-                self.time_accumulator += dt
-
-                if self.time_accumulator >= self.board.get_level_speed():
-                    self.display_time = int(self.elapsed_time)
-                    self.time_accumulator = 0.0
-                    can_move = self.board.move(Direction.DOWN)
-
-                    if not can_move:
-                        if not self.board.set_new_piece():
-                            self.board.set_game_state(GameState.DONE)
-                        self.board.remove_lines()
+            profiler.begin_frame()
+            if self.uncapped:
+                # Benchmark mode: exactly one logic tick per loop, as fast as the CPU allows
+                dt = self.timestep.step
+            elif self.low_latency:
+                with profiler.section("wait"):
+                    dt = self._wait_for_input()
             else:
-                self.time_accumulator = 0.0
+                with profiler.section("wait"):
+                    dt = self.clock.tick(self.render_fps) / 1000.0
+            self.elapsed_time += dt
 
-            if self.board.game_state == GameState.PLAY:
-                self.board.find_shadow_pos()
-            
-            self.handle_events()
-            self.draw()
+            # Logic runs in fixed ticks independent of the frame rate; the remainder carries over
+            with profiler.section("logic"):
+                for _ in range(self.timestep.advance(dt)):
+                    self.update(self.timestep.step)
+
+            with profiler.section("events"):
+                self.handle_events()
+            self._check_game_end()
+            if self._render_due():
+                self.draw()
+            profiler.end_frame()
+
+        self._finish_recording()
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.profile_path is not None:
+            profiler.dump(self.profile_path)
+        if self.trace_input:
+            for name, stats in self.input_latency.stats().items():
+                print(f"input latency ({name}): " + "  ".join(
+                    f"{key} {value * 1000:.2f}ms" if key != "count" else f"n {value}" for key, value in stats.items()))
+        if self.uncapped:
+            wall = time.perf_counter() - start
+            print(f"logic ticks: {self.timestep.ticks} in {wall:.2f}s ({self.timestep.ticks / wall:.0f} ticks/s, "
+                f"{self.elapsed_time / wall:.1f}x real time)")
         pygame.quit()
 
+    def _wait_for_input(self) -> float:
+        # Low-latency pacing: sleep toward the frame deadline in short slices and stop as soon as
+        # input is queued, so it is handled and drawn now instead of after a full clock.tick
+        if self.render_fps > 0:
+            deadline = self._frame_start + 1.0 / self.render_fps
+            while time.perf_counter() < deadline and not pygame.event.peek(self.INPUT_EVENTS):
+                if self.input_latency is not None:
+                    self.input_latency.checked_empty()
+                pygame.time.wait(1)
+        now = time.perf_counter()
+        dt = now - self._frame_start
+        self._frame_start = now
+        return dt
+
+    def _render_due(self) -> bool:
+        if not self.uncapped:
+            return True
+        if self.render_fps <= 0:
+            # Uncapped with no render rate measures the logic alone
+            return False
+
+        now = time.perf_counter()
+        if now < self._next_render:
+            return False
+        self._next_render = now + 1.0 / self.render_fps
+        return True
+
     def quit(self):
         self.is_running = False
 
+    def new_game(self):
+        self._finish_recording()
+        self.board.new_game()
+        self._play_ticks = 0
+        if self.record_path is not None:
+            self.recorder = ReplayRecorder(self.board.seed, self.logic_hz, self.timestep.ticks, self.board.size)
+
+    def perform(self, action: Action):
+        if self.recorder is not None:
+            self.recorder.record(self.timestep.ticks, action)
+        if self.input_latency is not None:
+            self.input_latency.record()
+        self.board.apply(action)
+
+    def _on_game_may_end(self, event):
+        self._game_may_have_ended = True
+
+    def _check_game_end(self):
+        # Checked after the frame's logic, so the final lock's line clears are in the stats
+        if not self._game_may_have_ended:
+            return
+        self._game_may_have_ended = False
+        if self.board.game_state == GameState.DONE or self.board.is_game_over():
+            self._finish_recording()
+            self._submit_score()
+
+    def _submit_score(self):
+        if self.leaderboard is None or self._play_ticks is None:
+            return
+        stats = self.board.game_stats
+        duration = self._play_ticks / self.logic_hz
+        self._play_ticks = None
+        self.leaderboard.submit(Score(self.player, stats.score, stats.lines_cleared, stats.level, duration,
+            time.time()))
+
+    def show_high_scores(self):
+        if self.leaderboard is None:
+            self.menu_renderer.show_scores(["Scores are not saved.", "Start with --scores PATH"])
+            return
+        scores = self.leaderboard.top(self.HIGH_SCORES)
+        self.menu_renderer.show_scores([format_score(place, score) for place, score in enumerate(scores, 1)])
+
+    def _finish_recording(self):
+        if self.recorder is None:
+            return
+        self.recorder.finish(self.timestep.ticks, self.board).save(self.record_path)
+        self.recorder = None
+
     def handle_events(self):
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if self.input_latency is not None:
+            self.input_latency.polled()
+        for event in events:
             if event.type == pygame.QUIT:
                 self.quit()
 
@@ -88,34 +292,45 @@ class App:
                 self.handle_mouse_down(event)
 
     def handle_key_down(self, event: pygame.event.Event):
+        if event.key == pygame.K_F3:
+            self.toggle_profiler_overlay()
+            return
+
+        if self.board.game_state == GameState.MENU and self.menu_renderer.scores is not None:
+            # Any key leaves the high score list, P included, so it never outlives its menu
+            self.menu_renderer.hide_scores()
+            return
+
         # Toggle pause/menu
         if event.key == pygame.K_p:
             if self.board.game_state == GameState.PLAY:
-                self.board._is_paused_menu = True
-                self.board.set_game_state(GameState.MENU)
+                self.perform(Action.PAUSE)
             elif self.board.game_state == GameState.MENU and self.board.is_paused_menu:
-                self.board._is_paused_menu = False
-                self.board.set_game_state(GameState.PLAY)
+                self.perform(Action.RESUME)
             return
 
         # Menu hotkeys
         if self.board.game_state == GameState.MENU:
             if event.key == pygame.K_1:
-                self.board._is_paused_menu = False
-                self.board.new_game()
+                self.new_game()
                 return
 
             if self.board.is_paused_menu:
-                # Paused menu: 2 = Resume, 4 = Exit
+                # Paused menu: 2 = Resume, 3 = High Score, 4 = Exit
                 if event.key == pygame.K_2:
-                    self.board._is_paused_menu = False
-                    self.board.set_game_state(GameState.PLAY)
+                    self.perform(Action.RESUME)
+                    return
+                if event.key == pygame.K_3:
+                    self.show_high_scores()
                     return
                 if event.key == pygame.K_4:
                     self.quit()
                     return
             else:
-                # Start menu: 3 = Exit
+                # Start menu: 2 = High Score, 3 = Exit
+                if event.key == pygame.K_2:
+                    self.show_high_scores()
+                    return
                 if event.key == pygame.K_3:
                     self.quit()
                     return
@@ -125,24 +340,9 @@ class App:
         if self.board.game_state == GameState.DONE:
             self.board.set_game_state(GameState.MENU)
         
-        can_move = True
-        if event.key == pygame.K_LEFT:
-            self.board.move(Direction.LEFT)
-        elif event.key == pygame.K_RIGHT:
-            self.board.move(Direction.RIGHT)
-        elif event.key == pygame.K_DOWN:
-            can_move = self.board.move(Direction.DOWN_WK)
-        elif event.key == pygame.K_a:
-            self.board.rotate(Heading.CCW)
-        elif event.key == pygame.K_s:
-            self.board.rotate(Heading.CW)
-        elif event.key == pygame.K_g:
-            self.board.toggle_shadow()
-
-        if not can_move:
-            if not self.board.set_new_piece():
-                self.board.set_game_state(GameState.DONE)
-            self.board.remove_lines()
+        action = self.KEY_ACTIONS.get(event.key)
+        if action is not None:
+            self.perform(action)
 
     def handle_mouse_down(self, event: pygame.event.Event):
         # Shell: editor/app mouse handling goes here
@@ -150,18 +350,88 @@ class App:
         pass
 
     def update(self, dt: float):
-        pass
+        if self._play_ticks is not None and self.board.game_state == GameState.PLAY:
+            self._play_ticks += 1
+        if self.board.update(dt):
+            self.display_time = int(self.elapsed_time)
 
     def draw(self):
-        # Fill screen with background 0,0,0
-        self.screen.fill(self.BG_COLOR)
+        # Renderers repaint only what changed and report it; None means present the whole screen
+        with self.profiler.section("draw"):
+            dirty = self.board.draw(self.screen)
+            if self.overlay is not None:
+                overlay_rects = self.overlay.draw(self.screen)
+                if dirty is not None:
+                    dirty += overlay_rects
 
-        # Draw UI
-        self.board.draw(self.screen)
+        with self.profiler.section("present"):
+            if dirty is None:
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
+        if self.input_latency is not None:
+            self.input_latency.presented()
+        if self.startup is not None:
+            self._finish_startup()
+        if self._icon_pending:
+            self._icon_pending = False
+            pygame.display.set_icon(self.assets.image(self.ICON))
 
-        pygame.display.flip()
+    def _finish_startup(self):
+        self.startup.mark("first frame")
+        print(self.startup.summary())
+        loaded = self.assets.load_times
+        print(f"assets: {len(loaded)} loaded in {sum(loaded.values()) * 1000:.1f}ms (" +
+            ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in loaded.items()) + ")")
+        self.quit()
+
+    def toggle_profiler_overlay(self):
+        if self.overlay is None:
+            return
+        self.overlay.toggle()
+        if not self.overlay.visible:
+            # Nothing repaints under the panel on its own
+            self.board.invalidate()
 
 
 if __name__ == "__main__":
-    app = App()
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument("--render-fps", type=int, default=App.FPS,
+        help="frames drawn per second (0 = a frame every loop; with --uncapped, 0 draws nothing)")
+    parser.add_argument("--logic-hz", type=int, default=App.LOGIC_HZ, help="fixed simulation ticks per second")
+    parser.add_argument("--uncapped", action="store_true",
+        help="run logic ticks back to back without sleeping and report ticks/s on exit")
+    parser.add_argument("--seed", type=int, default=None, help="seed the piece sequence for reproducible games")
+    parser.add_argument("--record", metavar="PATH", default=None,
+        help="write a replay of the latest game to PATH (play it back with replay.py)")
+    parser.add_argument("--profile", action="store_true",
+        help="time each frame phase; F3 toggles the overlay with p50/p95/p99")
+    parser.add_argument("--profile-out", metavar="PATH", default=None,
+        help="profile and write the per-frame trace to PATH on exit (.csv, otherwise JSON)")
+    parser.add_argument("--trace-input", action="store_true",
+        help="measure input-to-present latency and print p50/p95/p99 on exit")
+    parser.add_argument("--low-latency", action="store_true",
+        help="wake from the frame wait as soon as input arrives and draw it right away")
+    parser.add_argument("--size", type=parse_size, default=None, metavar="COLSxROWS",
+        help="board dimensions, 10x22 by default; boards larger than the window scroll with the piece")
+    parser.add_argument("--scores", metavar="PATH", nargs="?", const=DEFAULT_PATH, default=None,
+        help=f"save finished games to the leaderboard database at PATH (just --scores: {DEFAULT_PATH})")
+    parser.add_argument("--player", default=None, help="name scores are saved under (default: the login name)")
+    parser.add_argument("--telemetry", metavar="PATH", default=None,
+        help="log every lock, line clear, level up and game over to PATH as JSON lines")
+    parser.add_argument("--telemetry-gzip", action="store_true", help="compress rotated telemetry files")
+    parser.add_argument("--startup-time", action="store_true",
+        help="time the cold start up to the first frame on screen, print it and quit")
+    args = parser.parse_args()
+
+    startup = None
+    if args.startup_time:
+        startup = StartupTimer(STARTED)
+        startup.mark("imports")
+
+    app = App(render_fps=args.render_fps, logic_hz=args.logic_hz, uncapped=args.uncapped, seed=args.seed,
+        record_path=args.record, profile=args.profile, profile_path=args.profile_out, trace_input=args.trace_input,
+        low_latency=args.low_latency, size=args.size, startup=startup,
+        leaderboard_path=args.scores, player=args.player, telemetry_path=args.telemetry,
+        telemetry_gzip=args.telemetry_gzip)
     app.run()
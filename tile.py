@@ -2,6 +2,8 @@ from color import Color
 
 class Tile():
 
+    __slots__ = ("_color", "_id")
+
     def __init__(self, color: Color = Color.BLACK, aid: int=0):
         self._color = color
         self._id = aid
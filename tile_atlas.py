@@ -0,0 +1,34 @@
+import pygame
+from typing import Dict, Sequence, Tuple
+
+from color import Color
+
+
+class TileAtlas:
+
+    def __init__(self, colors: Sequence[Color], styles: Dict[str, Tuple[int, float, float]]):
+        # Every tile pre-rendered into one surface, a row per style and a column per colour.
+        # styles maps a name to (tile size, fill shade, outline shade) of the tile's colour.
+        width = len(colors) * max(size for size, _, _ in styles.values())
+        height = sum(size for size, _, _ in styles.values())
+        self.surface = pygame.Surface((width, height))
+        self._areas: Dict[str, Dict[Color, pygame.Rect]] = {}
+        top = 0
+        for name, (size, fill_factor, outline_factor) in styles.items():
+            areas = {}
+            for i, color in enumerate(colors):
+                tile = pygame.Surface((size, size))
+                rect = tile.get_rect()
+                pygame.draw.rect(tile, self._shade(color, fill_factor), rect)
+                pygame.draw.rect(tile, self._shade(color, outline_factor), rect, 2, border_radius=2)
+                areas[color] = self.surface.blit(tile, (i * size, top))
+            self._areas[name] = areas
+            top += size
+
+    @staticmethod
+    def _shade(rgb, factor: float) -> pygame.Color:
+        return pygame.Color(int(rgb[0] * factor), int(rgb[1] * factor), int(rgb[2] * factor))
+
+    def areas(self, style: str) -> Dict[Color, pygame.Rect]:
+        # Source rects of one style by colour, for (atlas.surface, dest, area) blits
+        return self._areas[style]
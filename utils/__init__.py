@@ -1,7 +1,11 @@
+from .assets import Assets
 from .game_state import GameState
 from .resources import Utils
+from .text_cache import TextCache
 
 __all_ = [
+    "Assets",
     "GameState",
     "Utils",
+    "TextCache",
 ]
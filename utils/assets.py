@@ -0,0 +1,41 @@
+import time
+from typing import Dict, Tuple
+
+from .resources import Utils
+
+
+class Assets:
+
+    FONT = "assets/fonts/ttf/JetBrainsMono-Regular.ttf"
+
+    def __init__(self):
+        # One handle per font size / image, loaded on first use and shared by whoever asks next
+        self._fonts: Dict[Tuple[str, int], object] = {}
+        self._images: Dict[Tuple[str, bool], object] = {}
+        # Seconds spent loading each asset
+        self.load_times: Dict[str, float] = {}
+
+    def font(self, size: int, rel_path: str = FONT):
+        key = (rel_path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            # pygame is imported here so headless code can use utils without loading it
+            import pygame
+            start = time.perf_counter()
+            font = pygame.font.Font(Utils.resource_path(rel_path), size)
+            self.load_times[f"{rel_path}@{size}"] = time.perf_counter() - start
+            self._fonts[key] = font
+        return font
+
+    def image(self, rel_path: str, alpha: bool = True):
+        # Converted to the display format, so the display must be set up first
+        key = (rel_path, alpha)
+        image = self._images.get(key)
+        if image is None:
+            import pygame
+            start = time.perf_counter()
+            image = pygame.image.load(Utils.resource_path(rel_path))
+            image = image.convert_alpha() if alpha else image.convert()
+            self.load_times[rel_path] = time.perf_counter() - start
+            self._images[key] = image
+        return image
@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+
+class TextCache:
+
+    DEFAULT_SIZE = 256
+
+    def __init__(self, max_size: int = DEFAULT_SIZE):
+        self.max_size = max_size
+        self._surfaces: "OrderedDict[Tuple[Hashable, ...], object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text: str, color, antialias: bool = True):
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)